@@ -38,6 +38,20 @@ goto :eof
 echo [1/3] 清理旧的构建文件...
 if exist "build" rmdir /s /q "build"
 if exist "dist" rmdir /s /q "dist"
+echo      打包纹理图集...
+python -m source.atlas
+if errorlevel 1 (
+    echo [错误] 纹理图集打包失败
+    pause
+    exit /b 1
+)
+echo      生成资源清单...
+python -m source.manifest
+if errorlevel 1 (
+    echo [错误] 资源清单生成失败
+    pause
+    exit /b 1
+)
 goto :eof
 
 :MODE_OFFLINE
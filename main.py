@@ -1,6 +1,15 @@
+import argparse
 import pygame as pg
 from source.main import main
 
 if __name__=='__main__':
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--headless', action='store_true',
+                        help='run without a window (SDL dummy driver) on a virtual clock')
+    parser.add_argument('--no-draw', action='store_true',
+                        help='skip all drawing, only run the game logic (implies --headless)')
+    parser.add_argument('--frames', type=int, default=None,
+                        help='exit after this many frames')
+    args = parser.parse_args()
+    main(headless=args.headless or args.no_draw, draw=not args.no_draw, frames=args.frames)
     pg.quit()
\ No newline at end of file
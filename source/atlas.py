@@ -0,0 +1,178 @@
+"""
+纹理图集打包工具
+
+把 resources/graphics、resources/origin_graphics 下的所有动画帧目录打包成少量大图，
+并为每个资源目录生成一个 JSON 索引（名称 -> 各帧所在的图集页和矩形）：
+
+    python -m source.atlas
+
+生成结果位于 resources/atlas/<资源目录名>/。运行时 tool.LazyGraphics 发现索引后，
+直接从图集页切出子 Surface，不再逐个打开帧文件。单张图片和尺寸过大的帧仍从原文件加载。
+资源有改动后需要重新运行打包。
+"""
+
+import os
+import json
+import time
+
+ATLAS_VERSION = 1
+INDEX_FILE = 'index.json'
+# 图集页的最大边长
+PAGE_SIZE = 2048
+# 宽或高超过该值的帧不进图集，整组动画仍从原文件加载
+MAX_FRAME_SIZE = 1024
+# 帧之间留 1 像素间隔，避免缩放采样时串色
+PADDING = 1
+SOURCE_DIRS = ('graphics', 'origin_graphics')
+
+
+def get_atlas_dir(directory):
+    """资源目录对应的图集输出目录，例如 resources/graphics -> resources/atlas/graphics"""
+    directory = os.path.normpath(directory)
+    root = os.path.dirname(directory)
+    return os.path.join(root, 'atlas', os.path.basename(directory))
+
+
+def load_index(directory):
+    """读取资源目录的图集索引
+
+    Returns:
+        dict: 索引内容；没有打包过或版本不符时返回 None
+    """
+    index_path = os.path.join(get_atlas_dir(directory), INDEX_FILE)
+    if not os.path.isfile(index_path):
+        return None
+    try:
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != ATLAS_VERSION:
+        return None
+    return index
+
+
+class ShelfPacker():
+    """简单的货架式装箱：按行从左到右摆放，当前行放不下就换行，页放满就开新页"""
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.pages = []     # 每页已使用的 (宽, 高)
+        self.x = 0
+        self.y = 0
+        self.shelf_height = 0
+
+    def _new_page(self):
+        self.pages.append([0, 0])
+        self.x = 0
+        self.y = 0
+        self.shelf_height = 0
+
+    def add(self, width, height):
+        """为一帧分配位置
+
+        Returns:
+            tuple: (页序号, x, y)
+        """
+        w = width + PADDING
+        h = height + PADDING
+        if not self.pages:
+            self._new_page()
+        if self.x + w > self.page_size:
+            self.x = 0
+            self.y += self.shelf_height
+            self.shelf_height = 0
+        if self.y + h > self.page_size:
+            self._new_page()
+
+        page = len(self.pages) - 1
+        pos = (page, self.x, self.y)
+        self.x += w
+        self.shelf_height = max(self.shelf_height, h)
+        used = self.pages[page]
+        used[0] = max(used[0], self.x)
+        used[1] = max(used[1], self.y + self.shelf_height)
+        return pos
+
+
+def build_atlas(directory, gfx_index, list_frames):
+    """把一个资源目录的所有动画帧打包成图集
+
+    Args:
+        directory: 资源目录，例如 resources/graphics
+        gfx_index: tool.index_all_gfx 返回的索引
+        list_frames: 返回帧目录下按序号排列的图片路径的函数
+
+    Returns:
+        dict: 写入 index.json 的索引内容
+    """
+    import pygame as pg
+
+    out_dir = get_atlas_dir(directory)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # 带透明通道的帧和不透明的帧分开打包，保证加载后的 convert 方式和原文件一致
+    packers = {True: ShelfPacker(PAGE_SIZE), False: ShelfPacker(PAGE_SIZE)}
+    placed = {True: [], False: []}
+    frames = {}
+
+    # 按目录顺序打包，同一类资源尽量落在同一页，按需加载时少解码无关的页
+    entries = sorted((path, name) for name, (kind, path) in gfx_index.items() if kind == 'frames')
+    for path, name in entries:
+        images = [pg.image.load(p) for p in list_frames(path, name)]
+        if not images or any(img.get_width() > MAX_FRAME_SIZE or
+                             img.get_height() > MAX_FRAME_SIZE for img in images):
+            continue
+        rects = []
+        for img in images:
+            alpha = bool(img.get_alpha())
+            page, x, y = packers[alpha].add(img.get_width(), img.get_height())
+            placed[alpha].append((page, x, y, img))
+            rects.append([alpha, page, x, y, img.get_width(), img.get_height()])
+        frames[name] = rects
+
+    pages = []
+    page_ids = {}
+    for alpha in (True, False):
+        for page, (width, height) in enumerate(packers[alpha].pages):
+            file_name = 'page_%s_%d.png' % ('alpha' if alpha else 'opaque', page)
+            page_ids[(alpha, page)] = len(pages)
+            pages.append({'file': file_name, 'alpha': alpha,
+                          'size': [width, height]})
+            flags = pg.SRCALPHA if alpha else 0
+            surface = pg.Surface((width, height), flags, 32)
+            surface.fill((0, 0, 0, 0))
+            for p, x, y, img in placed[alpha]:
+                if p == page:
+                    # 目标区域全为 0，取最大值等于原样拷贝像素（包括 alpha），不做混合
+                    surface.blit(img, (x, y), special_flags=pg.BLEND_RGBA_MAX)
+            pg.image.save(surface, os.path.join(out_dir, file_name))
+
+    index = {'version': ATLAS_VERSION,
+             'pages': pages,
+             'frames': {name: [[page_ids[(alpha, page)], x, y, w, h]
+                               for alpha, page, x, y, w, h in rects]
+                        for name, rects in frames.items()}}
+    with open(os.path.join(out_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return index
+
+
+def main():
+    # 打包只读写图片文件，不需要窗口，也不必调用 tool.init()
+    from . import tool
+    from .resource_path import resource_path
+
+    for name in SOURCE_DIRS:
+        directory = resource_path('resources', name)
+        start = time.time()
+        gfx_index = tool.index_all_gfx(directory)
+        index = build_atlas(directory, gfx_index,
+                            lambda path, image_name: tool.list_image_frames(
+                                path, image_name, ('.png', '.jpg', '.bmp', '.gif')))
+        frame_num = sum(len(rects) for rects in index['frames'].values())
+        print(f'{name}: {frame_num} frames -> {len(index["pages"])} pages '
+              f'({time.time() - start:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
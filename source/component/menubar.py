@@ -1,9 +1,11 @@
 __author__ = 'marble_xu'
 
+import math
 import random
 import pygame as pg
 from .. import tool
 from .. import constants as c
+from .. import fonts
 from ..language import LANG
 
 PANEL_Y_START = c.scale(87)
@@ -11,6 +13,8 @@ PANEL_X_START = c.scale(22)
 PANEL_Y_INTERNAL = c.scale(74)
 PANEL_X_INTERNAL = c.scale(53)
 CARD_LIST_NUM = 8
+# 卡片冷却遮罩高度的分级数
+CARD_COOLDOWN_STEPS = 32
 
 # 僵尸名称到行走动画帧的映射
 ZOMBIE_WALK_FRAMES = {
@@ -139,9 +143,9 @@ plant_frozen_time_list = [5000, 5000, 5000, 18000, 30000, 5000, 5000, 5000, 1800
 all_card_list = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
 
 def getSunValueImage(sun_value):
-    font = pg.font.SysFont(None, c.scale(22))
+    font = fonts.get_font(None, c.scale(22))
     min_width = c.scale(32)
-    msg_image = font.render(str(sun_value), True, c.NAVYBLUE, c.LIGHTYELLOW)
+    msg_image = fonts.render_digits(font, str(sun_value), c.NAVYBLUE, background=c.LIGHTYELLOW)
     msg_rect = msg_image.get_rect()
     msg_w = msg_rect.width
 
@@ -156,6 +160,108 @@ def getSunValueImage(sun_value):
     image.set_colorkey(c.BLACK)
     return image
 
+def buildCardImage(name, scale):
+    frame = tool.GFX[name]
+    rect = frame.get_rect()
+    width, height = rect.w, rect.h
+
+    # 判断是否为高清图片（尺寸超过阈值）
+    is_hd = width > c.HD_CARD_WIDTH_THRESHOLD or height > c.HD_CARD_HEIGHT_THRESHOLD
+
+    if is_hd:
+        # 高清图片：根据 scale 和标准参考尺寸动态计算目标，保持比例
+        target_w = int(c.CARD_REF_WIDTH * scale)
+        target_h = int(c.CARD_REF_HEIGHT * scale)
+        return tool.get_image_fit(
+            frame, 0, 0, width, height, c.BLACK,
+            target_width=target_w,
+            target_height=target_h,
+            keep_ratio=True
+        )
+    # 低分辨率图片：保持原有比例缩放（向后兼容）
+    return tool.get_image(frame, 0, 0, width, height, c.BLACK, scale)
+
+def loadCardImage(name, scale):
+    '''load the cropped and scaled card image, reuse the on-disk frame cache'''
+    return tool.load_derived_frames(name, ('card', scale),
+                                    lambda: [buildCardImage(name, scale)])[0]
+
+class CardImages():
+    '''一种卡片各显示状态的图片，每种 (卡片, 缩放比例) 只生成一次，卡片只切换引用
+
+    除 normal 外的图片在第一次用到时才生成：传送带上的卡片只用到 normal，
+    选卡面板中的卡片不会冷却。生成的图片记在卡片资源名下计入内存预算。
+    '''
+    def __init__(self, name, scale):
+        self.name = name
+        self.key = (name, scale)
+        self.normal = loadCardImage(name, scale)
+        self._disabled = None
+        self._unselected = None
+        self._cooldown = None
+
+    @property
+    def disabled(self):
+        '''阳光不足'''
+        if self._disabled is None:
+            self._disabled = self.createAlphaImage(192)
+            self.addToBudget([self._disabled])
+        return self._disabled
+
+    @property
+    def unselected(self):
+        '''选卡面板中已选中的卡片'''
+        if self._unselected is None:
+            self._unselected = self.createAlphaImage(128)
+            self.addToBudget([self._unselected])
+        return self._unselected
+
+    @property
+    def cooldown(self):
+        '''冷却中：第 i 张的遮罩高度为卡片高度的 (i + 1) / CARD_COOLDOWN_STEPS'''
+        if self._cooldown is None:
+            self._cooldown = [self.createCooldownImage(step)
+                              for step in range(1, CARD_COOLDOWN_STEPS + 1)]
+            self.addToBudget(self._cooldown)
+        return self._cooldown
+
+    def addToBudget(self, images):
+        # 已被淘汰出缓存的图片集只由持有它的卡片继续使用，不再记账
+        if _CARD_IMAGES.get(self.key) is self:
+            tool.GFX.add_derived(self.name, images, _CARD_IMAGES, self.key)
+
+    def createAlphaImage(self, alpha):
+        image = self.normal.copy()
+        image.set_alpha(alpha)
+        return image
+
+    def createCooldownImage(self, step):
+        width, height = self.normal.get_size()
+        frozen_height = int(step / CARD_COOLDOWN_STEPS * height)
+        image = pg.Surface([width, height])
+        image.blit(self.unselected, (0, 0), (0, 0, width, frozen_height))
+        image.blit(self.normal, (0, frozen_height),
+                   (0, frozen_height, width, height - frozen_height))
+        return image
+
+    def getCooldownImage(self, remain_time, frozen_time):
+        step = math.ceil(remain_time / frozen_time * CARD_COOLDOWN_STEPS)
+        step = min(max(step, 1), CARD_COOLDOWN_STEPS)
+        return self.cooldown[step - 1]
+
+_CARD_IMAGES = {}
+
+def getCardImages(name, scale):
+    key = (name, scale)
+    images = _CARD_IMAGES.get(key)
+    if images is None:
+        images = CardImages(name, scale)
+        _CARD_IMAGES[key] = images
+        images.addToBudget([images.normal])
+    else:
+        tool.GFX.touch(name)
+    return images
+
 def getCardPool(data):
     card_pool = []
     for card in data:
@@ -166,6 +272,109 @@ def getCardPool(data):
                 break
     return card_pool
 
+# 组合好的"AI护栏"面板：(语言, 面板高度) -> Surface，内容只随语言和布局变化
+_PROTECT_AI_PANELS = {}
+
+def createProtectAIPanel(box_height):
+    """组合"AI护栏"面板：背景、边框和两行描边文字"""
+    try:
+        font = fonts.get_font('SimHei', c.scale(22), bold=True)
+    except:
+        font = fonts.get_font(None, c.scale(24))
+
+    # 获取翻译文本并拆分为两行
+    text = LANG.get('protect_ai')
+    if 'AI' in text:
+        line1 = 'AI'
+        line2 = text.replace('AI', '').strip()
+    else:
+        line1 = text[:len(text)//2]
+        line2 = text[len(text)//2:]
+
+    # 计算两行文字的宽度，取最大值用于居中
+    line1_surface = font.render(line1, True, (255, 255, 255))
+    line2_surface = font.render(line2, True, (255, 255, 255))
+    max_text_width = max(line1_surface.get_width(), line2_surface.get_width())
+
+    # 背景框尺寸 - 与植物栏高度一致
+    box_width = max_text_width + c.scale(16)
+
+    # 绘制背景（与植物栏相似的棕色渐变）
+    bg_rect = pg.Rect(0, 0, box_width, box_height)
+    border_radius = c.scale(8)
+
+    # 背景填充 - 深棕色（圆角）+ 立体效果
+    surface = pg.Surface((box_width, box_height), pg.SRCALPHA)
+
+    # 外层阴影（向右下偏移，增加立体感）
+    shadow_offset = c.scale(3)
+    shadow_rect = pg.Rect(shadow_offset, shadow_offset, box_width, box_height)
+    pg.draw.rect(surface, (60, 30, 15), shadow_rect, border_radius=border_radius)
+
+    # 主背景色
+    pg.draw.rect(surface, (123, 62, 33), (0, 0, box_width, box_height), border_radius=border_radius)
+
+    # 内层高光边（左上方向，模拟光照）
+    inner_highlight = pg.Rect(c.scale(2), c.scale(2), box_width - c.scale(4), box_height - c.scale(4))
+    pg.draw.rect(surface, (145, 80, 45), inner_highlight, c.scale(1), border_radius=border_radius - c.scale(2))
+
+    # 绘制圆角边框（#8b411a）
+    border_color = (139, 65, 26)
+    pg.draw.rect(surface, border_color, bg_rect, c.scale(2), border_radius=border_radius)
+
+    # 文字颜色
+    shadow_color = (30, 20, 10)
+    outline_color = (139, 90, 43)
+    main_color = (255, 215, 0)
+    highlight_color = (255, 245, 180)
+
+    # 计算文字垂直居中位置
+    line_height = font.get_height()
+    total_text_height = line_height * 2 + c.scale(4)
+    start_y = (box_height - total_text_height) // 2
+
+    # 绘制两行文字（居中对齐）
+    for i, line_text in enumerate([line1, line2]):
+        text_surface = font.render(line_text, True, main_color)
+        text_width = text_surface.get_width()
+        # 水平居中
+        text_x = (box_width - text_width) // 2
+        text_y = start_y + i * (line_height + c.scale(4))
+
+        # 外层阴影
+        shadow_offset = c.scale(2)
+        shadow_surface = font.render(line_text, True, shadow_color)
+        surface.blit(shadow_surface, (text_x + shadow_offset, text_y + shadow_offset))
+
+        # 描边层
+        outline_offset = c.scale(1)
+        for dx in [-outline_offset, 0, outline_offset]:
+            for dy in [-outline_offset, 0, outline_offset]:
+                if dx != 0 or dy != 0:
+                    outline_surface = font.render(line_text, True, outline_color)
+                    surface.blit(outline_surface, (text_x + dx, text_y + dy))
+
+        # 主文字
+        main_surface = font.render(line_text, True, main_color)
+        surface.blit(main_surface, (text_x, text_y))
+
+        # 高光层
+        highlight_surface = font.render(line_text, True, highlight_color)
+        highlight_surface.set_alpha(80)
+        surface.blit(highlight_surface, (text_x - c.scale(1), text_y - c.scale(1)))
+
+    return surface
+
+def getProtectAIPanel(box_height):
+    key = (LANG.get_current_language(), box_height)
+    panel = _PROTECT_AI_PANELS.get(key)
+    if panel is None:
+        panel = createProtectAIPanel(box_height)
+        _PROTECT_AI_PANELS[key] = panel
+    return panel
+
+LANG.add_listener(lambda language: _PROTECT_AI_PANELS.clear())
+
 class Card():
     def __init__(self, x, y, name_index, scale=0.78):
         self.loadFrame(card_name_list[name_index], scale)
@@ -181,26 +390,8 @@ class Card():
         self.select = True
 
     def loadFrame(self, name, scale):
-        frame = tool.GFX[name]
-        rect = frame.get_rect()
-        width, height = rect.w, rect.h
-
-        # 判断是否为高清图片（尺寸超过阈值）
-        is_hd = width > c.HD_CARD_WIDTH_THRESHOLD or height > c.HD_CARD_HEIGHT_THRESHOLD
-
-        if is_hd:
-            # 高清图片：根据 scale 和标准参考尺寸动态计算目标，保持比例
-            target_w = int(c.CARD_REF_WIDTH * scale)
-            target_h = int(c.CARD_REF_HEIGHT * scale)
-            self.orig_image = tool.get_image_fit(
-                frame, 0, 0, width, height, c.BLACK,
-                target_width=target_w,
-                target_height=target_h,
-                keep_ratio=True
-            )
-        else:
-            # 低分辨率图片：保持原有比例缩放（向后兼容）
-            self.orig_image = tool.get_image(frame, 0, 0, width, height, c.BLACK, scale)
+        self.images = getCardImages(name, scale)
+        self.orig_image = self.images.normal
 
         self.image = self.orig_image
 
@@ -230,31 +421,23 @@ class Card():
     def setSelect(self, can_select):
         self.select = can_select
         if can_select:
-            self.image.set_alpha(255)
+            self.image = self.images.normal
         else:
-            self.image.set_alpha(128)
+            self.image = self.images.unselected
 
     def setFrozenTime(self, current_time):
         self.frozen_timer = current_time
 
     def createShowImage(self, sun_value, current_time):
-        '''create a card image to show cool down status
+        '''select the prebuilt card image to show cool down status
            or disable status when have not enough sun value'''
         time = current_time - self.frozen_timer
         if time < self.frozen_time: #cool down status
-            image = pg.Surface([self.rect.w, self.rect.h])
-            frozen_image = self.orig_image.copy()
-            frozen_image.set_alpha(128)
-            frozen_height = (self.frozen_time - time)/self.frozen_time * self.rect.h
-            
-            image.blit(frozen_image, (0,0), (0, 0, self.rect.w, frozen_height))
-            image.blit(self.orig_image, (0,frozen_height),
-                       (0, frozen_height, self.rect.w, self.rect.h - frozen_height))
+            image = self.images.getCooldownImage(self.frozen_time - time, self.frozen_time)
         elif self.sun_cost > sun_value: #disable status
-            image = self.orig_image.copy()
-            image.set_alpha(192)
+            image = self.images.disabled
         else:
-            image = self.orig_image
+            image = self.images.normal
         return image
 
     def update(self, sun_value, current_time):
@@ -273,9 +456,13 @@ class MenuBar():
         self.rect.y = 0
 
         self.sun_value = sun_value
+        # 已经画到 self.image 上的阳光值，数值不变时不再重画
+        self.drawn_sun_value = None
         self.card_offset_x = c.scale(32)
         self.setupCards(card_list)
         self.tooltip = Tooltip()
+        # 本帧绘制过的区域（植物栏、卡片、分数等），由 draw 重置
+        self.drawn_rects = []
 
     def loadFrame(self, name):
         frame = tool.GFX[name]
@@ -312,7 +499,7 @@ class MenuBar():
         rect = self.image.get_rect()
         width = rect.w
         height = rect.h
-        self.image = pg.Surface((width * num, height)).convert()
+        self.image = tool.convert_display(pg.Surface((width * num, height)))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -358,6 +545,9 @@ class MenuBar():
                 break
 
     def drawSunValue(self):
+        if self.sun_value == self.drawn_sun_value:
+            return
+        self.drawn_sun_value = self.sun_value
         self.value_image = getSunValueImage(self.sun_value)
         self.value_rect = self.value_image.get_rect()
         self.value_rect.x = c.scale(21)
@@ -375,8 +565,8 @@ class MenuBar():
         Returns:
             int: 面板底部 y 坐标，供 Timer 定位使用
         """
-        font = pg.font.SysFont('Arial', c.scale(24))
-        score_text = font.render(f'Score: {score}', True, c.GOLD)
+        font = fonts.get_font('Arial', c.scale(24))
+        score_text = fonts.render_digits(font, f'Score: {score}', c.GOLD)
 
         # 计算文本矩形，放置在右上角最右边
         text_rect = score_text.get_rect()
@@ -401,6 +591,7 @@ class MenuBar():
 
         # 绘制边框
         pg.draw.rect(surface, c.GOLD, bg_rect, c.scale(1), border_radius=c.scale(5))
+        self.drawn_rects.append(bg_rect)
 
         # 绘制文本
         surface.blit(score_text, (text_rect.x, text_rect.y))
@@ -424,8 +615,8 @@ class MenuBar():
         minutes = seconds // 60
         seconds = seconds % 60
 
-        font = pg.font.SysFont('Arial', c.scale(24))
-        time_text = font.render(f'Time: {minutes:02d}:{seconds:02d}', True, c.WHITE)
+        font = fonts.get_font('Arial', c.scale(24))
+        time_text = fonts.render_digits(font, f'Time: {minutes:02d}:{seconds:02d}', c.WHITE)
 
         # 计算文本矩形，放置在 Score 下方
         text_rect = time_text.get_rect()
@@ -466,6 +657,7 @@ class MenuBar():
 
         # 绘制边框
         pg.draw.rect(surface, c.WHITE, bg_rect, c.scale(1), border_radius=c.scale(5))
+        self.drawn_rects.append(bg_rect)
 
         # 绘制文本
         surface.blit(time_text, (text_rect.x, text_rect.y))
@@ -477,8 +669,8 @@ class MenuBar():
             kills: 击杀数字典
         """
         total_kills = sum(kills.values())
-        font = pg.font.SysFont('Arial', c.scale(24))
-        kills_text = font.render(f'Kills: {total_kills}', True, c.WHITE)
+        font = fonts.get_font('Arial', c.scale(24))
+        kills_text = fonts.render_digits(font, f'Kills: {total_kills}', c.WHITE)
 
         # 计算文本矩形，放置在右上角
         text_rect = kills_text.get_rect()
@@ -502,6 +694,7 @@ class MenuBar():
 
         # 绘制边框
         pg.draw.rect(surface, c.WHITE, bg_rect, c.scale(1), border_radius=c.scale(5))
+        self.drawn_rects.append(bg_rect)
 
         # 绘制文本
         surface.blit(kills_text, (text_rect.x, text_rect.y))
@@ -512,97 +705,9 @@ class MenuBar():
             surface: 绘制表面
             right_margin: 右边界 x 坐标（如果有得分面板，传入其左边界）
         """
-        try:
-            font = pg.font.SysFont('SimHei', c.scale(22), bold=True)
-        except:
-            font = pg.font.SysFont(None, c.scale(24))
-
-        # 获取翻译文本并拆分为两行
-        text = LANG.get('protect_ai')
-        if 'AI' in text:
-            line1 = 'AI'
-            line2 = text.replace('AI', '').strip()
-        else:
-            line1 = text[:len(text)//2]
-            line2 = text[len(text)//2:]
-
-        # 计算两行文字的宽度，取最大值用于居中
-        line1_surface = font.render(line1, True, (255, 255, 255))
-        line2_surface = font.render(line2, True, (255, 255, 255))
-        max_text_width = max(line1_surface.get_width(), line2_surface.get_width())
-
-        # 背景框尺寸 - 与植物栏高度一致
-        box_width = max_text_width + c.scale(16)
-        box_height = self.rect.height
         box_x = self.rect.right - c.scale(2)  # 紧贴植物栏，略微重叠融合
-        box_y = self.rect.y
-
-        # 绘制背景（与植物栏相似的棕色渐变）
-        bg_rect = pg.Rect(box_x, box_y, box_width, box_height)
-        border_radius = c.scale(8)
-
-        # 背景填充 - 深棕色（圆角）+ 立体效果
-        bg_surface = pg.Surface((box_width, box_height), pg.SRCALPHA)
-
-        # 外层阴影（向右下偏移，增加立体感）
-        shadow_offset = c.scale(3)
-        shadow_rect = pg.Rect(shadow_offset, shadow_offset, box_width, box_height)
-        pg.draw.rect(bg_surface, (60, 30, 15), shadow_rect, border_radius=border_radius)
-
-        # 主背景色
-        pg.draw.rect(bg_surface, (123, 62, 33), (0, 0, box_width, box_height), border_radius=border_radius)
-
-        # 内层高光边（左上方向，模拟光照）
-        inner_highlight = pg.Rect(c.scale(2), c.scale(2), box_width - c.scale(4), box_height - c.scale(4))
-        pg.draw.rect(bg_surface, (145, 80, 45), inner_highlight, c.scale(1), border_radius=border_radius - c.scale(2))
-
-        surface.blit(bg_surface, (box_x, box_y))
-
-        # 绘制圆角边框（#8b411a）
-        border_color = (139, 65, 26)
-        pg.draw.rect(surface, border_color, bg_rect, c.scale(2), border_radius=border_radius)
-
-        # 文字颜色
-        shadow_color = (30, 20, 10)
-        outline_color = (139, 90, 43)
-        main_color = (255, 215, 0)
-        highlight_color = (255, 245, 180)
-
-        # 计算文字垂直居中位置
-        line_height = font.get_height()
-        total_text_height = line_height * 2 + c.scale(4)
-        start_y = box_y + (box_height - total_text_height) // 2
-
-        # 绘制两行文字（居中对齐）
-        for i, line_text in enumerate([line1, line2]):
-            text_surface = font.render(line_text, True, main_color)
-            text_width = text_surface.get_width()
-            # 水平居中
-            text_x = box_x + (box_width - text_width) // 2
-            text_y = start_y + i * (line_height + c.scale(4))
-
-            # 外层阴影
-            shadow_offset = c.scale(2)
-            shadow_surface = font.render(line_text, True, shadow_color)
-            surface.blit(shadow_surface, (text_x + shadow_offset, text_y + shadow_offset))
-
-            # 描边层
-            outline_offset = c.scale(1)
-            for dx in [-outline_offset, 0, outline_offset]:
-                for dy in [-outline_offset, 0, outline_offset]:
-                    if dx != 0 or dy != 0:
-                        outline_surface = font.render(line_text, True, outline_color)
-                        surface.blit(outline_surface, (text_x + dx, text_y + dy))
-
-            # 主文字
-            main_surface = font.render(line_text, True, main_color)
-            surface.blit(main_surface, (text_x, text_y))
-
-            # 高光层
-            highlight_surface = font.render(line_text, True, highlight_color)
-            highlight_surface.set_alpha(80)
-            surface.blit(highlight_surface, (text_x - c.scale(1), text_y - c.scale(1)))
-
+        self.drawn_rects.append(
+            surface.blit(getProtectAIPanel(self.rect.height), (box_x, self.rect.y)))
         return box_x
 
     def draw(self, surface):
@@ -610,10 +715,14 @@ class MenuBar():
         surface.blit(self.image, self.rect)
         for card in self.card_list:
             card.draw(surface)
+        # 记录本帧绘制过的区域，供关卡按脏矩形重绘
+        self.drawn_rects = [self.rect] + [card.rect for card in self.card_list]
 
     def drawTooltip(self, surface):
         """单独绘制 tooltip，确保显示在最上层"""
         self.tooltip.draw(surface)
+        if self.tooltip.visible and self.tooltip.rect:
+            self.drawn_rects.append(self.tooltip.rect)
 
 class Panel():
     def __init__(self, card_list, sun_value, zombie_types=None):
@@ -812,9 +921,9 @@ class Panel():
 
         # 绘制标题
         try:
-            title_font = pg.font.SysFont('SimHei', c.scale(20), bold=True)
+            title_font = fonts.get_font('SimHei', c.scale(20), bold=True)
         except:
-            title_font = pg.font.SysFont(None, c.scale(22))
+            title_font = fonts.get_font(None, c.scale(22))
         title_text = title_font.render(LANG.get('zombie_preview_title'), True, (255, 215, 100))
         title_rect = title_text.get_rect(centerx=preview_x + preview_width // 2,
                                          y=preview_y + c.scale(12))
@@ -829,9 +938,9 @@ class Panel():
         start_y = preview_y + c.scale(50)
 
         try:
-            name_font = pg.font.SysFont('SimHei', c.scale(12))
+            name_font = fonts.get_font('SimHei', c.scale(12))
         except:
-            name_font = pg.font.SysFont(None, c.scale(14))
+            name_font = fonts.get_font(None, c.scale(14))
 
         for i, zombie_name in enumerate(self.zombie_types):
             if zombie_name not in self.zombie_frames:
@@ -886,26 +995,7 @@ class MoveCard():
         self.select = True
 
     def loadFrame(self, name, scale):
-        frame = tool.GFX[name]
-        rect = frame.get_rect()
-        width, height = rect.w, rect.h
-
-        # 判断是否为高清图片（尺寸超过阈值）
-        is_hd = width > c.HD_CARD_WIDTH_THRESHOLD or height > c.HD_CARD_HEIGHT_THRESHOLD
-
-        if is_hd:
-            # 高清图片：根据 scale 和标准参考尺寸动态计算目标，保持比例
-            target_w = int(c.CARD_REF_WIDTH * scale)
-            target_h = int(c.CARD_REF_HEIGHT * scale)
-            self.orig_image = tool.get_image_fit(
-                frame, 0, 0, width, height, c.BLACK,
-                target_width=target_w,
-                target_height=target_h,
-                keep_ratio=True
-            )
-        else:
-            # 低分辨率图片：保持原有比例缩放（向后兼容）
-            self.orig_image = tool.get_image(frame, 0, 0, width, height, c.BLACK, scale)
+        self.orig_image = getCardImages(name, scale).normal
 
         self.orig_rect = self.orig_image.get_rect()
         self.image = self.orig_image
@@ -951,6 +1041,8 @@ class MoveBar():
         self.card_pool = card_pool
         self.card_list = []
         self.create_timer = -c.MOVEBAR_CARD_FRESH_TIME
+        # 本帧绘制过的区域，由 draw 重置
+        self.drawn_rects = []
 
     def loadFrame(self, name):
         frame = tool.GFX[name]
@@ -1004,6 +1096,8 @@ class MoveBar():
         surface.blit(self.image, self.rect)
         for card in self.card_list:
             card.draw(surface)
+        # 记录本帧绘制过的区域，供关卡按脏矩形重绘
+        self.drawn_rects = [self.rect] + [card.rect for card in self.card_list]
 
     def drawTooltip(self, surface):
         """MoveBar 不需要 Tooltip，空实现以保持接口一致"""
@@ -1015,97 +1109,9 @@ class MoveBar():
             surface: 绘制表面
             right_margin: 右边界 x 坐标
         """
-        try:
-            font = pg.font.SysFont('SimHei', c.scale(22), bold=True)
-        except:
-            font = pg.font.SysFont(None, c.scale(24))
-
-        # 获取翻译文本并拆分为两行
-        text = LANG.get('protect_ai')
-        if 'AI' in text:
-            line1 = 'AI'
-            line2 = text.replace('AI', '').strip()
-        else:
-            line1 = text[:len(text)//2]
-            line2 = text[len(text)//2:]
-
-        # 计算两行文字的宽度，取最大值用于居中
-        line1_surface = font.render(line1, True, (255, 255, 255))
-        line2_surface = font.render(line2, True, (255, 255, 255))
-        max_text_width = max(line1_surface.get_width(), line2_surface.get_width())
-
-        # 背景框尺寸 - 与植物栏高度一致
-        box_width = max_text_width + c.scale(16)
-        box_height = self.rect.height
         box_x = self.rect.right - c.scale(2)  # 紧贴植物栏，略微重叠融合
-        box_y = self.rect.y
-
-        # 绘制背景（与植物栏相似的棕色渐变）
-        bg_rect = pg.Rect(box_x, box_y, box_width, box_height)
-        border_radius = c.scale(8)
-
-        # 背景填充 - 深棕色（圆角）+ 立体效果
-        bg_surface = pg.Surface((box_width, box_height), pg.SRCALPHA)
-
-        # 外层阴影（向右下偏移，增加立体感）
-        shadow_offset = c.scale(3)
-        shadow_rect = pg.Rect(shadow_offset, shadow_offset, box_width, box_height)
-        pg.draw.rect(bg_surface, (60, 30, 15), shadow_rect, border_radius=border_radius)
-
-        # 主背景色
-        pg.draw.rect(bg_surface, (123, 62, 33), (0, 0, box_width, box_height), border_radius=border_radius)
-
-        # 内层高光边（左上方向，模拟光照）
-        inner_highlight = pg.Rect(c.scale(2), c.scale(2), box_width - c.scale(4), box_height - c.scale(4))
-        pg.draw.rect(bg_surface, (145, 80, 45), inner_highlight, c.scale(1), border_radius=border_radius - c.scale(2))
-
-        surface.blit(bg_surface, (box_x, box_y))
-
-        # 绘制圆角边框（#8b411a）
-        border_color = (139, 65, 26)
-        pg.draw.rect(surface, border_color, bg_rect, c.scale(2), border_radius=border_radius)
-
-        # 文字颜色
-        shadow_color = (30, 20, 10)
-        outline_color = (139, 90, 43)
-        main_color = (255, 215, 0)
-        highlight_color = (255, 245, 180)
-
-        # 计算文字垂直居中位置
-        line_height = font.get_height()
-        total_text_height = line_height * 2 + c.scale(4)
-        start_y = box_y + (box_height - total_text_height) // 2
-
-        # 绘制两行文字（居中对齐）
-        for i, line_text in enumerate([line1, line2]):
-            text_surface = font.render(line_text, True, main_color)
-            text_width = text_surface.get_width()
-            # 水平居中
-            text_x = box_x + (box_width - text_width) // 2
-            text_y = start_y + i * (line_height + c.scale(4))
-
-            # 外层阴影
-            shadow_offset = c.scale(2)
-            shadow_surface = font.render(line_text, True, shadow_color)
-            surface.blit(shadow_surface, (text_x + shadow_offset, text_y + shadow_offset))
-
-            # 描边层
-            outline_offset = c.scale(1)
-            for dx in [-outline_offset, 0, outline_offset]:
-                for dy in [-outline_offset, 0, outline_offset]:
-                    if dx != 0 or dy != 0:
-                        outline_surface = font.render(line_text, True, outline_color)
-                        surface.blit(outline_surface, (text_x + dx, text_y + dy))
-
-            # 主文字
-            main_surface = font.render(line_text, True, main_color)
-            surface.blit(main_surface, (text_x, text_y))
-
-            # 高光层
-            highlight_surface = font.render(line_text, True, highlight_color)
-            highlight_surface.set_alpha(80)
-            surface.blit(highlight_surface, (text_x - c.scale(1), text_y - c.scale(1)))
-
+        self.drawn_rects.append(
+            surface.blit(getProtectAIPanel(self.rect.height), (box_x, self.rect.y)))
         return box_x
 
 
@@ -1126,12 +1132,19 @@ class Tooltip:
     # 行间距
     LINE_SPACING = c.scale(2)
 
+    # 静态层（背景、边框、文字）：(植物名, 语言) -> Surface
+    _LAYER_CACHE = {}
+    # 右侧缩放后的植物动画帧：植物名 -> [(Surface, 位置) 或 None]
+    _PREVIEW_CACHE = {}
+
     def __init__(self):
         self.visible = False
         self.image = None
         self.rect = None
         self.plant_name_index = -1
         self.animation_frames = None
+        # 动画帧所在的资源表（ORIGIN_GFX 或 GFX），缓存的静态层和预览帧记在它名下
+        self.animation_source = tool.GFX
         self.frame_index = 0
         self.animation_timer = 0
         self.card_rect = None
@@ -1154,8 +1167,14 @@ class Tooltip:
         # 加载植物动画帧
         self._loadAnimationFrames(plant_name)
 
-        # 构建 Tooltip Surface
-        self._buildTooltipSurface(plant_name, current_time)
+        # 静态层每种植物、每种语言只构建一次，动画帧在 draw 时单独叠加
+        key = (plant_name, LANG.get_current_language())
+        self.image = self._LAYER_CACHE.get(key)
+        if self.image is None:
+            self._buildTooltipSurface(plant_name)
+            self._LAYER_CACHE[key] = self.image
+            self.animation_source.add_derived(plant_name, (self.image,), self._LAYER_CACHE, key)
+        self.rect = self.image.get_rect()
 
         # 计算位置
         self._updatePosition(card.rect)
@@ -1171,8 +1190,10 @@ class Tooltip:
     def _loadAnimationFrames(self, plant_name):
         """加载植物动画帧"""
         if plant_name in tool.ORIGIN_GFX:
+            self.animation_source = tool.ORIGIN_GFX
             self.animation_frames = tool.ORIGIN_GFX[plant_name]
         elif plant_name in tool.GFX:
+            self.animation_source = tool.GFX
             frames = tool.GFX[plant_name]
             if isinstance(frames, list):
                 self.animation_frames = frames
@@ -1197,8 +1218,8 @@ class Tooltip:
             lines.append(current_line)
         return lines
 
-    def _buildTooltipSurface(self, plant_name, current_time):
-        """构建 Tooltip 显示 Surface"""
+    def _buildTooltipSurface(self, plant_name):
+        """构建 Tooltip 的静态层（不含植物动画）"""
         # 创建 Tooltip Surface
         self.image = pg.Surface((self.TOOLTIP_WIDTH, self.TOOLTIP_HEIGHT), pg.SRCALPHA)
 
@@ -1212,24 +1233,22 @@ class Tooltip:
         pg.draw.rect(self.image, border_color, (0, 0, self.TOOLTIP_WIDTH, self.TOOLTIP_HEIGHT),
                      width=c.scale(2), border_radius=c.scale(10))
 
-        # 绘制植物图像和标题
+        # 绘制标题和说明
         self._drawHeader(plant_name)
 
-        self.rect = self.image.get_rect()
-
     def _drawHeader(self, plant_name):
-        """绘制左中右布局：左侧（产品名+介绍），中间（参照原型+植物名称），右侧（植物图像）"""
+        """绘制左中右布局：左侧（产品名+介绍），中间（参照原型+植物名称），右侧留给植物动画"""
         # 字体
         try:
-            product_font = pg.font.SysFont('SimHei', c.scale(14), bold=True)
-            desc_font = pg.font.SysFont('SimHei', c.scale(11))
-            label_font = pg.font.SysFont('SimHei', c.scale(11))
-            plant_name_font = pg.font.SysFont('SimHei', c.scale(14), bold=True)
+            product_font = fonts.get_font('SimHei', c.scale(14), bold=True)
+            desc_font = fonts.get_font('SimHei', c.scale(11))
+            label_font = fonts.get_font('SimHei', c.scale(11))
+            plant_name_font = fonts.get_font('SimHei', c.scale(14), bold=True)
         except:
-            product_font = pg.font.SysFont(None, c.scale(16))
-            desc_font = pg.font.SysFont(None, c.scale(13))
-            label_font = pg.font.SysFont(None, c.scale(13))
-            plant_name_font = pg.font.SysFont(None, c.scale(16))
+            product_font = fonts.get_font(None, c.scale(16))
+            desc_font = fonts.get_font(None, c.scale(13))
+            label_font = fonts.get_font(None, c.scale(13))
+            plant_name_font = fonts.get_font(None, c.scale(16))
 
         # ========== 左侧区域（产品名+介绍）==========
         text_x = self.PADDING
@@ -1294,11 +1313,20 @@ class Tooltip:
                      (separator2_x, self.TOOLTIP_HEIGHT - self.PADDING - c.scale(5)),
                      width=c.scale(1))
 
-        # ========== 右侧区域（植物图像）==========
-        img_x = self.TOOLTIP_WIDTH - self.PADDING - self.PLANT_DISPLAY_SIZE
-        img_y = (self.TOOLTIP_HEIGHT - self.PLANT_DISPLAY_SIZE) // 2  # 垂直居中
-        if self.animation_frames and len(self.animation_frames) > 0:
-            frame = self.animation_frames[self.frame_index % len(self.animation_frames)]
+    def _getPreviewFrame(self):
+        """返回右侧区域当前的植物动画帧及其在 Tooltip 内的位置，缩放结果按植物缓存"""
+        plant_name = plant_name_list[self.plant_name_index]
+        previews = self._PREVIEW_CACHE.get(plant_name)
+        if previews is None or len(previews) != len(self.animation_frames):
+            previews = [None] * len(self.animation_frames)
+            self._PREVIEW_CACHE[plant_name] = previews
+
+        index = self.frame_index % len(self.animation_frames)
+        if previews[index] is None:
+            # ========== 右侧区域（植物图像）==========
+            img_x = self.TOOLTIP_WIDTH - self.PADDING - self.PLANT_DISPLAY_SIZE
+            img_y = (self.TOOLTIP_HEIGHT - self.PLANT_DISPLAY_SIZE) // 2  # 垂直居中
+            frame = self.animation_frames[index]
             frame_rect = frame.get_rect()
 
             scale_x = self.PLANT_DISPLAY_SIZE / frame_rect.width
@@ -1311,7 +1339,9 @@ class Tooltip:
 
             img_draw_x = img_x + (self.PLANT_DISPLAY_SIZE - new_width) // 2
             img_draw_y = img_y + (self.PLANT_DISPLAY_SIZE - new_height) // 2
-            self.image.blit(scaled_frame, (img_draw_x, img_draw_y))
+            previews[index] = (scaled_frame, (img_draw_x, img_draw_y))
+            self.animation_source.add_derived(plant_name, (scaled_frame,), self._PREVIEW_CACHE, plant_name)
+        return previews[index]
 
     def _updatePosition(self, card_rect):
         """更新 Tooltip 位置，确保不超出屏幕"""
@@ -1353,13 +1383,10 @@ class Tooltip:
             self.animation_timer = current_time
             self.frame_index = (self.frame_index + 1) % len(self.animation_frames)
 
-            # 重新绘制
-            plant_name = plant_name_list[self.plant_name_index]
-            self._buildTooltipSurface(plant_name, current_time)
-            if self.card_rect:
-                self._updatePosition(self.card_rect)
-
     def draw(self, surface):
-        """绘制 Tooltip"""
+        """绘制 Tooltip：静态层加当前的植物动画帧"""
         if self.visible and self.image and self.rect:
             surface.blit(self.image, self.rect)
+            if self.animation_frames:
+                frame, (x, y) = self._getPreviewFrame()
+                surface.blit(frame, (self.rect.x + x, self.rect.y + y))
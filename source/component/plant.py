@@ -58,6 +58,12 @@ class Bullet(pg.sprite.Sprite):
         self.current_time = 0
 
     def loadFrames(self, frames, name):
+        frames.extend(tool.load_derived_frames(
+            name, ('bullet', tool.PLANT_RECT.get(name)),
+            lambda: self.buildFrames(name)))
+
+    def buildFrames(self, name):
+        frames = []
         frame_list = tool.GFX[name]
         if name in tool.PLANT_RECT:
             data = tool.PLANT_RECT[name]
@@ -98,17 +104,9 @@ class Bullet(pg.sprite.Sprite):
             else:
                 frames.append(tool.get_image(frame, x, y, width, height,
                                             None if use_alpha else c.BLACK))
+        return frames
     
     def load_images(self):
-        cached = Bullet._FRAME_CACHE.get(self.name)
-        if cached:
-            self.fly_frames, self.explode_frames = cached
-            self.frames = self.fly_frames
-            return
-
-        self.fly_frames = []
-        self.explode_frames = []
-
         fly_name = self.name
         if self.name == c.BULLET_MUSHROOM:
             explode_name = 'BulletMushRoomExplode'
@@ -119,10 +117,23 @@ class Bullet(pg.sprite.Sprite):
         else:
             explode_name = 'PeaNormalExplode'
 
+        cached = Bullet._FRAME_CACHE.get(self.name)
+        if cached:
+            self.fly_frames, self.explode_frames = cached
+            self.frames = self.fly_frames
+            tool.GFX.touch(fly_name)
+            tool.GFX.touch(explode_name)
+            return
+
+        self.fly_frames = []
+        self.explode_frames = []
+
         self.loadFrames(self.fly_frames, fly_name)
         self.loadFrames(self.explode_frames, explode_name)
 
         Bullet._FRAME_CACHE[self.name] = (self.fly_frames, self.explode_frames)
+        tool.GFX.add_derived(fly_name, self.fly_frames, Bullet._FRAME_CACHE, self.name)
+        tool.GFX.add_derived(explode_name, self.explode_frames, Bullet._FRAME_CACHE, self.name)
         self.frames = self.fly_frames
 
     def update(self, game_info):
@@ -148,7 +159,85 @@ class Bullet(pg.sprite.Sprite):
     def draw(self, surface):
         surface.blit(self.image, self.rect)
 
+# 拖动卡片时跟随鼠标的植物图片的缩放比例，未列出的植物为 0.75
+MOUSE_IMAGE_SCALES = {
+    c.SQUASH: 0.5,
+    c.CHOMPER: 0.85,
+    c.SNOWPEASHOOTER: 0.95,
+    c.PEASHOOTER: 0.95,
+    c.REPEATERPEA: 1.1,
+    c.WALLNUT: 1.1,
+    c.SUNFLOWER: 0.88,
+    c.THREEPEASHOOTER: 0.85,
+    c.CHERRYBOMB: 0.85,
+    c.POTATOMINE: 1,
+    c.SPIKEWEED: 1,
+    c.JALAPENO: 1,
+}
+# 以白色为透明色裁剪的植物
+MOUSE_IMAGE_WHITE_KEY = (c.SCAREDYSHROOM, c.SUNSHROOM, c.ICESHROOM, c.HYPNOSHROOM,
+                         c.WALLNUTBOWLING, c.REDWALLNUTBOWLING)
+
+# 植物名 -> (跟随鼠标的图片, 种植位置的半透明提示图片)
+_MOUSE_IMAGES = {}
+
+def createMouseImages(plant_name):
+    frame_list = tool.GFX[plant_name]
+    if plant_name in tool.PLANT_RECT:
+        data = tool.PLANT_RECT[plant_name]
+        x, y, width, height = data['x'], data['y'], data['width'], data['height']
+    else:
+        x, y = 0, 0
+        min_w = min(f.get_rect().w for f in frame_list)
+        min_h = min(f.get_rect().h for f in frame_list)
+        width, height = min_w, min_h
+
+    color = c.WHITE if plant_name in MOUSE_IMAGE_WHITE_KEY else c.BLACK
+    scale = MOUSE_IMAGE_SCALES.get(plant_name, 0.75)
+
+    frame = frame_list[0]
+    actual_rect = frame.get_rect()
+    actual_w, actual_h = actual_rect.w, actual_rect.h
+    expected_w = x + width
+    expected_h = y + height
+    is_hd = (actual_w > expected_w * 2 or actual_h > expected_h * 2)
+
+    if is_hd:
+        hd_ratio = actual_w / expected_w if expected_w > 0 else 1
+        scaled_x = int(x * hd_ratio)
+        scaled_y = int(y * hd_ratio)
+        crop_width = int(width * hd_ratio)
+        crop_height = int(height * hd_ratio)
+        target_width = int(width * scale * c.ASSET_SCALE)
+        target_height = int(height * scale * c.ASSET_SCALE)
+        mouse_image = tool.get_image_fit(
+            frame, scaled_x, scaled_y, crop_width, crop_height, color,
+            target_width=target_width, target_height=target_height)
+    else:
+        mouse_image = tool.get_image(frame, x, y, width, height, color, scale)
+
+    width, height = mouse_image.get_size()
+    hint_image = pg.Surface([width, height])
+    hint_image.blit(mouse_image, (0, 0), (0, 0, width, height))
+    hint_image.set_colorkey(c.BLACK)
+    hint_image.set_alpha(128)
+    return mouse_image, hint_image
+
+def getMouseImages(plant_name):
+    """拖动卡片时的 (跟随鼠标的图片, 半透明提示图片)，每种植物只生成一次，调用方不要修改"""
+    images = _MOUSE_IMAGES.get(plant_name)
+    if images is None:
+        images = createMouseImages(plant_name)
+        _MOUSE_IMAGES[plant_name] = images
+        tool.GFX.add_derived(plant_name, images, _MOUSE_IMAGES, plant_name)
+    else:
+        tool.GFX.touch(plant_name)
+    return images
+
 class Plant(pg.sprite.Sprite):
+    # 所有植物共用的动画帧：(名称, 缩放比例, colorkey) -> 帧列表，种植时不再重复裁剪缩放
+    _FRAME_CACHE = {}
+
     def __init__(self, x, y, name, health, bullet_group, scale=1):
         pg.sprite.Sprite.__init__(self)
         
@@ -169,10 +258,23 @@ class Plant(pg.sprite.Sprite):
         self.animate_timer = 0
         self.animate_interval = 100
         self.hit_timer = 0
-        self._last_alpha = None
-        self._last_image = None
 
     def loadFrames(self, frames, name, scale, color=c.BLACK):
+        key = (name, scale, color)
+        cached = Plant._FRAME_CACHE.get(key)
+        if cached is None:
+            cached = tool.load_derived_frames(
+                name, ('plant', tool.PLANT_RECT.get(name), scale, color),
+                lambda: self.buildFrames(name, scale, color))
+            tool.make_frame_variants(cached)
+            Plant._FRAME_CACHE[key] = cached
+            tool.GFX.add_derived(name, cached, Plant._FRAME_CACHE, key)
+        else:
+            tool.GFX.touch(name)
+        frames.extend(cached)
+
+    def buildFrames(self, name, scale, color=c.BLACK):
+        frames = []
         frame_list = tool.GFX[name]
         if name in tool.PLANT_RECT:
             data = tool.PLANT_RECT[name]
@@ -219,6 +321,7 @@ class Plant(pg.sprite.Sprite):
             else:
                 frames.append(tool.get_image(frame, x, y, width, height,
                                             None if use_alpha else color, scale))
+        return frames
 
     def loadImages(self, name, scale):
         self.loadFrames(self.frames, name, scale)
@@ -266,11 +369,8 @@ class Plant(pg.sprite.Sprite):
             self.animate_timer = self.current_time
         
         self.image = self.frames[self.frame_index]
-        target_alpha = 255 if (self.current_time - self.hit_timer) >= 200 else 192
-        if self.image is not self._last_image or target_alpha != self._last_alpha:
-            self.image.set_alpha(target_alpha)
-            self._last_image = self.image
-            self._last_alpha = target_alpha
+        if (self.current_time - self.hit_timer) < 200:
+            self.image = tool.get_frame_variant(self.image, 'hit')
 
     def canAttack(self, zombie):
         if (self.state != c.SLEEP and zombie.state != c.DIE and
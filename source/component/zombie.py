@@ -6,6 +6,10 @@ from .. import constants as c
 
 class Zombie(pg.sprite.Sprite):
     _FRAME_CACHE = {}
+    # 被催眠后使用的水平翻转帧：类 -> {动画名（如 'walk_frames'）: 翻转后的帧列表}
+    _FLIPPED_CACHE = {}
+    # 每种僵尸的动画帧取自哪些资源：类 -> 资源名列表
+    _FRAME_SOURCES = {}
 
     def __init__(self, x, y, name, health, head_group=None, damage=1):
         pg.sprite.Sprite.__init__(self)
@@ -13,7 +17,9 @@ class Zombie(pg.sprite.Sprite):
         self.name = name
         self.frames = []
         self.frame_index = 0
+        self.frame_sources = []
         self.loadImages()
+        self.touchFrames()
         self.frame_num = len(self.frames)
 
         self.image = self.frames[self.frame_index]
@@ -40,9 +46,6 @@ class Zombie(pg.sprite.Sprite):
         self.speed = c.scale(1)
         self.freeze_timer = 0
         self.is_hypno = False # the zombie is hypo and attack other zombies when it ate a HypnoShroom
-        self._flip_cache = {}
-        self._last_alpha = None
-        self._last_image = None
 
         # 碰撞矩形：缩小碰撞区域，避免击中图片前面的空白
         # 必须在 is_hypno 初始化之后设置
@@ -52,6 +55,30 @@ class Zombie(pg.sprite.Sprite):
         self.updateHitbox()
     
     def loadFrames(self, frames, name, image_x, colorkey=c.BLACK, scale=1):
+        loaded = tool.load_derived_frames(
+            name, ('zombie', image_x, colorkey, scale),
+            lambda: self.buildFrames(name, image_x, colorkey, scale))
+        tool.make_frame_variants(loaded)
+        frames.extend(loaded)
+        self.frame_sources.append((name, loaded))
+
+    def cacheFrames(self, cache):
+        '''保存这种僵尸的全部动画帧供之后创建的同种僵尸共用，帧记在各自源资源名下计入内存预算'''
+        cls = self.__class__
+        Zombie._FRAME_CACHE[cls] = cache
+        # 翻转帧由旧的帧生成，随旧的帧作废
+        Zombie._FLIPPED_CACHE.pop(cls, None)
+        Zombie._FRAME_SOURCES[cls] = [name for name, _ in self.frame_sources]
+        for name, loaded in self.frame_sources:
+            tool.GFX.add_derived(name, loaded, Zombie._FRAME_CACHE, cls)
+            tool.GFX.add_derived(name, (), Zombie._FLIPPED_CACHE, cls)
+
+    def touchFrames(self):
+        for name in Zombie._FRAME_SOURCES.get(self.__class__, ()):
+            tool.GFX.touch(name)
+
+    def buildFrames(self, name, image_x, colorkey=c.BLACK, scale=1):
+        frames = []
         frame_list = tool.GFX[name]
 
         for frame in frame_list:
@@ -81,6 +108,7 @@ class Zombie(pg.sprite.Sprite):
                 # 低清图使用原有逻辑
                 width = actual_w - image_x
                 frames.append(tool.get_image(frame, image_x, 0, width, actual_h, colorkey))
+        return frames
 
     def update(self, game_info):
         self.current_time = game_info[c.CURRENT_TIME]
@@ -174,11 +202,7 @@ class Zombie(pg.sprite.Sprite):
 
     def animation(self):
         if self.state == c.FREEZE:
-            target_alpha = 192
-            if self.image is not self._last_image or target_alpha != self._last_alpha:
-                self.image.set_alpha(target_alpha)
-                self._last_image = self.image
-                self._last_alpha = target_alpha
+            self.image = tool.get_frame_variant(self.frames[self.frame_index], 'frozen')
             return
 
         if (self.current_time - self.animate_timer) > (self.animate_interval * self.getTimeRatio()):
@@ -191,11 +215,8 @@ class Zombie(pg.sprite.Sprite):
             self.animate_timer = self.current_time
 
         self.image = self.frames[self.frame_index]
-        target_alpha = 255 if (self.current_time - self.hit_timer) >= 200 else 192
-        if self.image is not self._last_image or target_alpha != self._last_alpha:
-            self.image.set_alpha(target_alpha)
-            self._last_image = self.image
-            self._last_alpha = target_alpha
+        if (self.current_time - self.hit_timer) < 200:
+            self.image = tool.get_frame_variant(self.image, 'hit')
 
     def getTimeRatio(self):
         return self.ice_slow_ratio
@@ -279,14 +300,34 @@ class Zombie(pg.sprite.Sprite):
         self.is_hypno = True
         self.setWalk()
 
+    def getFlippedFrames(self, frames):
+        '''一组帧水平翻转后的帧列表（被催眠后使用），同一种僵尸的每种动画只翻转一次，按动画名缓存，随这种僵尸共用的帧一起淘汰'''
+        cls = self.__class__
+        cache = Zombie._FRAME_CACHE.get(cls, {})
+        animation = next((key for key, cached in cache.items() if cached is frames), None)
+        if animation is None:
+            # 共用的帧已因内存预算被淘汰，这只僵尸仍持有原帧，翻转结果不再缓存
+            flipped_frames = [pg.transform.flip(frame, True, False) for frame in frames]
+            tool.make_frame_variants(flipped_frames)
+            return flipped_frames
+        flipped = Zombie._FLIPPED_CACHE.setdefault(cls, {})
+        flipped_frames = flipped.get(animation)
+        if flipped_frames is None:
+            flipped_frames = [pg.transform.flip(frame, True, False) for frame in frames]
+            tool.make_frame_variants(flipped_frames)
+            flipped[animation] = flipped_frames
+            tool.GFX.add_derived(self.name, flipped_frames, Zombie._FLIPPED_CACHE, cls)
+        return flipped_frames
+
+    def loadFlippedFrames(self):
+        '''预先生成这种僵尸全部动画的翻转帧'''
+        for frames in Zombie._FRAME_CACHE.get(self.__class__, {}).values():
+            self.getFlippedFrames(frames)
+
     def _get_frames(self, frames):
         if not self.is_hypno:
             return frames
-        cached = self._flip_cache.get(id(frames))
-        if cached is None:
-            cached = [pg.transform.flip(frame, True, False) for frame in frames]
-            self._flip_cache[id(frames)] = cached
-        return cached
+        return self.getFlippedFrames(frames)
 
 class ZombieHead(Zombie):
     def __init__(self, x, y):
@@ -304,9 +345,9 @@ class ZombieHead(Zombie):
         die_name =  self.name
         self.loadFrames(self.die_frames, die_name, 0)
         self.frames = self.die_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'die_frames': self.die_frames
-        }
+        })
 
     def setWalk(self):
         self.animate_interval = 100
@@ -350,14 +391,14 @@ class NormalZombie(Zombie):
             self.loadFrames(frame_list[i], name, tool.ZOMBIE_RECT[name]['x'])
 
         self.frames = self.walk_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'walk_frames': self.walk_frames,
             'attack_frames': self.attack_frames,
             'losthead_walk_frames': self.losthead_walk_frames,
             'losthead_attack_frames': self.losthead_attack_frames,
             'die_frames': self.die_frames,
             'boomdie_frames': self.boomdie_frames
-        }
+        })
 
 class ConeHeadZombie(Zombie):
     def __init__(self, x, y, head_group):
@@ -407,7 +448,7 @@ class ConeHeadZombie(Zombie):
             self.loadFrames(frame_list[i], name, tool.ZOMBIE_RECT[name]['x'])
 
         self.frames = self.helmet_walk_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'helmet_walk_frames': self.helmet_walk_frames,
             'helmet_attack_frames': self.helmet_attack_frames,
             'walk_frames': self.walk_frames,
@@ -416,7 +457,7 @@ class ConeHeadZombie(Zombie):
             'losthead_attack_frames': self.losthead_attack_frames,
             'die_frames': self.die_frames,
             'boomdie_frames': self.boomdie_frames
-        }
+        })
 
 class BucketHeadZombie(Zombie):
     def __init__(self, x, y, head_group):
@@ -466,7 +507,7 @@ class BucketHeadZombie(Zombie):
             self.loadFrames(frame_list[i], name, tool.ZOMBIE_RECT[name]['x'])
 
         self.frames = self.helmet_walk_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'helmet_walk_frames': self.helmet_walk_frames,
             'helmet_attack_frames': self.helmet_attack_frames,
             'walk_frames': self.walk_frames,
@@ -475,7 +516,7 @@ class BucketHeadZombie(Zombie):
             'losthead_attack_frames': self.losthead_attack_frames,
             'die_frames': self.die_frames,
             'boomdie_frames': self.boomdie_frames
-        }
+        })
 
 class FlagZombie(Zombie):
     def __init__(self, x, y, head_group):
@@ -516,14 +557,14 @@ class FlagZombie(Zombie):
             self.loadFrames(frame_list[i], name, tool.ZOMBIE_RECT[name]['x'])
 
         self.frames = self.walk_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'walk_frames': self.walk_frames,
             'attack_frames': self.attack_frames,
             'losthead_walk_frames': self.losthead_walk_frames,
             'losthead_attack_frames': self.losthead_attack_frames,
             'die_frames': self.die_frames,
             'boomdie_frames': self.boomdie_frames
-        }
+        })
 
 class NewspaperZombie(Zombie):
     def __init__(self, x, y, head_group):
@@ -586,7 +627,7 @@ class NewspaperZombie(Zombie):
             self.loadFrames(frame_list[i], name, tool.ZOMBIE_RECT[name]['x'], color, scale)
 
         self.frames = self.helmet_walk_frames
-        Zombie._FRAME_CACHE[self.__class__] = {
+        self.cacheFrames({
             'helmet_walk_frames': self.helmet_walk_frames,
             'helmet_attack_frames': self.helmet_attack_frames,
             'walk_frames': self.walk_frames,
@@ -595,4 +636,4 @@ class NewspaperZombie(Zombie):
             'losthead_attack_frames': self.losthead_attack_frames,
             'die_frames': self.die_frames,
             'boomdie_frames': self.boomdie_frames
-        }
+        })
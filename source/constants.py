@@ -16,6 +16,11 @@ ASSET_PIXEL_RATIO = 1
 # 资源缩放因子（渲染缩放 / 资源像素比例）
 ASSET_SCALE = RENDER_SCALE / ASSET_PIXEL_RATIO
 
+# 已解码图片（tool.GFX / tool.ORIGIN_GFX）的内存预算（字节），切换状态时超出预算会淘汰最久未使用的资源：根据情况修改
+# 0 表示不限制。疯狂模式一局（含受击/冰冻变体）实测约 747 MiB，默认值取它之上；
+# 关卡运行中用到的图片不会被淘汰，关卡结束后预算按实测的工作集提高（见 tool.GraphicsBudget）
+GFX_MEMORY_BUDGET = 768 * 1024 * 1024
+
 def scale(value):
     return int(round(value * RENDER_SCALE))
 
@@ -257,3 +262,10 @@ ZOMBIE_SCORES = {
 GAME_MODE_NORMAL = 'normal'
 GAME_MODE_CRAZY = 'crazy'
 CRAZY_MODE_DURATION = 120000  # 120 seconds in milliseconds
+CRAZY_LEVEL_NUM = 'crazy'  # 疯狂模式关卡文件 level_crazy.json
+
+#ASSET PREFETCH
+PREFETCH_FRAME_BUDGET = 8  # 登录/加载页面每帧用于预取下一关资源的时间（毫秒）
+
+#DIRTY RECT RENDERING
+DIRTY_RECT_RENDERING = False  # 关卡进行中只重绘和刷新有变化的区域，软件渲染的机器上可以打开
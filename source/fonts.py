@@ -0,0 +1,215 @@
+"""
+字体注册表
+
+pg.font.SysFont 每次调用都会查找系统字体并重新打开字体文件，在绘制函数里逐帧调用开销很大。
+这里按 (字体名, 字号, 粗体, 斜体) 缓存 Font 对象，整个进程每种组合只打开一次。
+返回的 Font 对象是共用的，调用方不要修改其粗体、下划线等属性。
+
+第一次按名称查找系统字体时 pygame 会枚举系统中安装的全部字体（Linux 上调用 fc-list），
+启动时明显变慢。查找结果（字体名 -> 字体文件）保存在用户数据目录的 cache/fonts.json，
+之后启动直接使用；字体文件的修改时间变化或文件不存在时重新查找。找不到的字体同样记录，
+字体目录或 fontconfig 缓存目录的修改时间变化（安装或删除了字体）时才重新查找。
+
+HUD 上的分数、倒计时等文字每秒最多变化几次，render_text / render_digits 把渲染结果放进
+容量有限的 LRU 缓存，数字按单个字形缓存后拼接，数值变化时也不必重新光栅化整串文字。
+"""
+
+import os
+import re
+import sys
+import json
+from collections import OrderedDict
+import pygame as pg
+from pygame.sysfont import font_constructor
+from .resource_path import user_data_path
+
+FONT_CACHE_VERSION = 1
+FONT_CACHE_FILE = user_data_path('cache', 'fonts.json')
+# 文字渲染结果缓存的容量
+TEXT_CACHE_SIZE = 256
+
+# (字体名, 字号, 粗体, 斜体) -> pg.font.Font
+_FONTS = {}
+# 已解析的系统字体：'字体名|粗体|斜体' -> [字体文件, 是否模拟粗体, 是否模拟斜体, 文件 mtime_ns]
+# 找不到的字体：字体文件为 None，最后一项为记录时的 _font_dirs_stamp()
+_resolved = None
+# 字体目录的修改时间，每个进程只读取一次
+_dirs_stamp = None
+# (字体, 文字, 颜色, 抗锯齿, 背景色) -> Surface，最近使用的排在最后
+_TEXTS = OrderedDict()
+# 把文字拆成单个数字和连续的非数字片段
+_DIGIT_RE = re.compile(r'\d|\D+')
+
+
+def _load_resolved():
+    global _resolved
+    if _resolved is None:
+        try:
+            with open(FONT_CACHE_FILE, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != FONT_CACHE_VERSION:
+                raise ValueError('font cache version mismatch')
+            _resolved = data['fonts']
+        except (OSError, ValueError, KeyError):
+            _resolved = {}
+    return _resolved
+
+
+def _save_resolved():
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        tmp_path = FONT_CACHE_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': FONT_CACHE_VERSION, 'fonts': _resolved}, f, ensure_ascii=False)
+        os.replace(tmp_path, FONT_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _font_dirs():
+    """安装字体时会变化的目录：系统和用户的字体目录，以及 fontconfig 的缓存目录"""
+    home = os.path.expanduser('~')
+    if sys.platform == 'win32':
+        return [os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+                os.path.join(os.environ.get('LOCALAPPDATA', home), 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.join(home, '.fonts'), os.path.join(home, '.local', 'share', 'fonts'),
+            '/var/cache/fontconfig', os.path.join(home, '.cache', 'fontconfig')]
+
+
+def _font_dirs_stamp():
+    """字体目录的修改时间列表，目录不存在时为 None"""
+    global _dirs_stamp
+    if _dirs_stamp is None:
+        _dirs_stamp = []
+        for path in _font_dirs():
+            try:
+                _dirs_stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                _dirs_stamp.append(None)
+    return _dirs_stamp
+
+
+def resolve_font(name, bold=False, italic=False):
+    """查找系统字体对应的字体文件，结果与 pg.font.SysFont 一致
+
+    Returns:
+        tuple: (字体文件，找不到时为 None 表示 pygame 默认字体, 是否模拟粗体, 是否模拟斜体)
+    """
+    if not name:
+        # 默认字体不需要枚举系统字体
+        return None, bold, italic
+
+    resolved = _load_resolved()
+    key = '%s|%d|%d' % (name, bold, italic)
+    entry = resolved.get(key)
+    if entry:
+        path, set_bold, set_italic, stamp = entry
+        if path is None:
+            if stamp == _font_dirs_stamp():
+                return path, set_bold, set_italic
+        else:
+            try:
+                if os.stat(path).st_mtime_ns == stamp:
+                    return path, set_bold, set_italic
+            except OSError:
+                pass
+
+    # 借用 SysFont 的查找逻辑，只记录它最终选中的文件和样式
+    result = []
+    pg.font.SysFont(name, 1, bold, italic,
+                    constructor=lambda path, size, set_bold, set_italic:
+                        result.append((path, set_bold, set_italic)))
+    path, set_bold, set_italic = result[0]
+    if path:
+        try:
+            resolved[key] = [path, set_bold, set_italic, os.stat(path).st_mtime_ns]
+        except OSError:
+            return path, set_bold, set_italic
+    else:
+        # 找不到字体也记录，之后安装了字体时字体目录的修改时间会变化
+        resolved[key] = [None, set_bold, set_italic, _font_dirs_stamp()]
+    _save_resolved()
+    return path, set_bold, set_italic
+
+
+def get_font(name, size, bold=False, italic=False):
+    """获取字体
+
+    Args:
+        name: 系统字体名，与 pg.font.SysFont 相同；None 表示 pygame 默认字体
+        size: 字号（已经过 c.scale 缩放）
+        bold: 是否粗体
+        italic: 是否斜体
+
+    Returns:
+        pg.font.Font
+    """
+    key = (name, size, bold, italic)
+    font = _FONTS.get(key)
+    if font is None:
+        path, set_bold, set_italic = resolve_font(name, bold, italic)
+        font = font_constructor(path, size, set_bold, set_italic)
+        _FONTS[key] = font
+    return font
+
+
+def _get_text(key):
+    image = _TEXTS.get(key)
+    if image is not None:
+        _TEXTS.move_to_end(key)
+    return image
+
+
+def _add_text(key, image):
+    _TEXTS[key] = image
+    if len(_TEXTS) > TEXT_CACHE_SIZE:
+        _TEXTS.popitem(last=False)
+
+
+def render_text(font, text, color, antialias=True, background=None):
+    """渲染文字，结果按 (字体, 文字, 颜色, 抗锯齿, 背景色) 缓存
+
+    返回的 Surface 是共用的，调用方不要修改（例如 set_alpha），需要时先 copy()。
+    """
+    key = (font, text, tuple(color), antialias,
+           tuple(background) if background is not None else None)
+    image = _get_text(key)
+    if image is None:
+        if background is None:
+            image = font.render(text, antialias, color)
+        else:
+            image = font.render(text, antialias, color, background)
+        _add_text(key, image)
+    return image
+
+
+def render_digits(font, text, color, antialias=True, background=None):
+    """渲染频繁变化的数字文字，例如 'Score: 12345'
+
+    每个数字和每段非数字文字各自经 render_text 缓存，按字体的排版位置拼接成整串；拼接结果同样进入缓存。
+    返回的 Surface 是共用的，调用方不要修改。
+    """
+    key = ('digits', font, text, tuple(color), antialias,
+           tuple(background) if background is not None else None)
+    image = _get_text(key)
+    if image is None:
+        # 每段放在整串文字中它之前部分的宽度处，保留字体的字距调整，宽度与直接 font.render 一致
+        parts = []
+        start = 0
+        for part in _DIGIT_RE.findall(text):
+            parts.append((render_text(font, part, color, antialias, background), font.size(text[:start])[0]))
+            start += len(part)
+        width = font.size(text)[0]
+        height = max([part.get_height() for part, _ in parts] + [font.get_height()])
+        if background is None:
+            image = pg.Surface((width, height), pg.SRCALPHA)
+        else:
+            image = pg.Surface((width, height))
+            image.fill(background)
+        for part, x in parts:
+            image.blit(part, (x, 0))
+        _add_text(key, image)
+    return image
@@ -0,0 +1,177 @@
+"""
+派生帧磁盘缓存
+
+Plant / Zombie / Bullet / Card 加载时会对原始帧做裁剪和缩放（高清素材还要 smoothscale），
+每次启动都重复这些运算。这里把最终得到的 Surface 像素保存到用户数据目录下，
+下次启动命中缓存时直接还原像素，不再解码原图，也不再做任何变换。
+
+缓存键由以下内容组成：
+    源文件内容的哈希、调用方给出的裁剪参数（裁剪矩形、colorkey、缩放比例等）、
+    c.ASSET_SCALE 和 c.ASSET_PIXEL_RATIO。
+任意一项变化都会生成新的缓存文件。裁剪/缩放代码本身改动后需要提高 CACHE_VERSION。
+"""
+
+import os
+import json
+import hashlib
+import zlib
+import pygame as pg
+from . import constants as c
+from .resource_path import user_data_path
+
+CACHE_VERSION = 2
+CACHE_DIR = user_data_path('cache', 'frames')
+HASH_FILE = 'hashes.json'
+
+# 源文件哈希：路径 -> [mtime_ns, 文件大小, 哈希]，文件未改动时不必重新读取内容
+_file_hashes = None
+_file_hashes_dirty = False
+
+
+def _load_file_hashes():
+    global _file_hashes
+    if _file_hashes is None:
+        try:
+            with open(os.path.join(CACHE_DIR, HASH_FILE), encoding='utf-8') as f:
+                _file_hashes = json.load(f)
+        except (OSError, ValueError):
+            _file_hashes = {}
+    return _file_hashes
+
+
+def _save_file_hashes():
+    global _file_hashes_dirty
+    if not _file_hashes_dirty:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = os.path.join(CACHE_DIR, HASH_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_file_hashes, f)
+        os.replace(tmp_path, os.path.join(CACHE_DIR, HASH_FILE))
+        _file_hashes_dirty = False
+    except OSError:
+        pass
+
+
+def hash_file(path):
+    """返回文件内容的哈希，按 (mtime, 大小) 记忆，未改动的文件不会重新读取"""
+    global _file_hashes_dirty
+    hashes = _load_file_hashes()
+    stat = os.stat(path)
+    cached = hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    hashes[path] = [stat.st_mtime_ns, stat.st_size, value]
+    _file_hashes_dirty = True
+    return value
+
+
+def make_key(source_files, params):
+    key = [CACHE_VERSION, c.ASSET_SCALE, c.ASSET_PIXEL_RATIO, list(params),
+           [hash_file(path) for path in source_files]]
+    return hashlib.sha1(json.dumps(key, default=str).encode('utf-8')).hexdigest()
+
+
+def _iter_read(path):
+    """逐帧还原缓存文件中的帧，每还原一帧 yield 一次，生成器的返回值是帧列表"""
+    with open(path, 'rb') as f:
+        header = json.loads(f.readline().decode('utf-8'))
+        data = f.read()
+
+    decompressor = zlib.decompressobj()
+    frames = []
+    has_display = pg.display.get_surface() is not None
+    for width, height, mode, colorkey in header:
+        size = width * height * len(mode)
+        # 按帧解压，避免一次解压整个文件
+        chunk = decompressor.decompress(data, size)
+        data = decompressor.unconsumed_tail
+        if len(chunk) != size:
+            raise ValueError('truncated frame cache file')
+        image = pg.image.frombytes(chunk, (width, height), mode)
+        if mode == 'RGBA':
+            if has_display:
+                image = image.convert_alpha()
+        else:
+            if has_display:
+                image = image.convert()
+            if colorkey is not None:
+                image.set_colorkey(colorkey)
+        frames.append(image)
+        yield
+    return frames
+
+
+def _iter_write(path, frames):
+    """把帧写入缓存文件，每压缩一帧 yield 一次"""
+    header = []
+    chunks = []
+    compressor = zlib.compressobj(1)
+    for image in frames:
+        mode = 'RGBA' if image.get_flags() & pg.SRCALPHA else 'RGB'
+        colorkey = image.get_colorkey()
+        header.append([image.get_width(), image.get_height(), mode,
+                       list(colorkey) if colorkey is not None else None])
+        chunks.append(compressor.compress(pg.image.tobytes(image, mode)))
+        yield
+    chunks.append(compressor.flush())
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header).encode('utf-8') + b'\n')
+        f.write(b''.join(chunks))
+    os.replace(tmp_path, path)
+
+
+def load_frames(source_files, params, builder):
+    """读取派生帧，未命中缓存时调用 builder 生成并写入缓存
+
+    Args:
+        source_files: 派生帧依赖的源图片文件路径
+        params: 影响裁剪/缩放结果的参数（可 JSON 序列化）
+        builder: 无参函数，返回派生出的 Surface 列表
+
+    Returns:
+        list: Surface 列表
+    """
+    steps = iter_frames(source_files, params, builder)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+
+
+def iter_frames(source_files, params, builder):
+    """与 load_frames 相同，但每读取或写入一帧 yield 一次，可以分多帧完成
+
+    生成器的返回值是 Surface 列表。
+    """
+    try:
+        key = make_key(source_files, params)
+    except OSError:
+        return builder()
+    _save_file_hashes()
+    path = os.path.join(CACHE_DIR, key + '.bin')
+
+    if os.path.isfile(path):
+        try:
+            return (yield from _iter_read(path))
+        except (OSError, ValueError, zlib.error, pg.error):
+            # 缓存文件损坏时重新生成
+            pass
+
+    frames = builder()
+    try:
+        yield from _iter_write(path, frames)
+    except (OSError, pg.error):
+        pass
+    return frames
@@ -9,6 +9,8 @@ class LanguageManager:
     def __init__(self, default_language=c.LANGUAGE_ZH_CN):
         self.current_language = default_language
         self.translations = {}
+        # 切换语言时的回调，用于清除按语言缓存的渲染结果
+        self._listeners = []
         self._load_translations()
 
     def _load_translations(self):
@@ -230,13 +232,25 @@ class LanguageManager:
         """获取翻译文本"""
         return self.translations.get(self.current_language, {}).get(key, default)
 
+    def get_for_language(self, language, key, default=''):
+        """获取指定语言的翻译文本，不切换当前语言"""
+        return self.translations.get(language, {}).get(key, default)
+
     def set_language(self, language):
         """切换语言"""
         if language in self.translations:
+            changed = language != self.current_language
             self.current_language = language
+            if changed:
+                for listener in self._listeners:
+                    listener(language)
             return True
         return False
 
+    def add_listener(self, listener):
+        """注册切换语言时的回调，回调参数为新的语言"""
+        self._listeners.append(listener)
+
     def get_current_language(self):
         """获取当前语言"""
         return self.current_language
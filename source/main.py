@@ -4,8 +4,16 @@ from . import tool
 from . import constants as c
 from .state import mainmenu, screen, level, loading, login, report
 
-def main():
-    game = tool.Control()
+def main(headless=False, draw=True, frames=None):
+    """启动游戏
+
+    Args:
+        headless: 不显示窗口（SDL dummy 驱动），不刷新屏幕、不限制帧率，使用虚拟时钟
+        draw: 是否绘制画面，只运行游戏逻辑时设为 False
+        frames: 运行的帧数，None 表示一直运行到退出
+    """
+    tool.init(headless=headless)
+    game = tool.Control(draw=draw)
     state_dict = {c.LOADING_SCREEN: loading.LoadingScreen(),
                   c.LOGIN_SCREEN: login.LoginScreen(),
                   c.MAIN_MENU: mainmenu.Menu(),
@@ -14,4 +22,4 @@ def main():
                   c.GAME_REPORT: report.GameReportScreen(),
                   c.LEVEL: level.Level()}
     game.setup_states(state_dict, c.LOGIN_SCREEN)
-    game.main()
\ No newline at end of file
+    game.main(frames)
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+图片资源清单
+
+运行时 tool.LazyGraphics 默认逐层 os.listdir 资源目录，并从文件名里解析帧序号。
+打包后的程序里资源位于 PyInstaller 解压的临时目录，大量目录遍历和 stat 很慢，
+因此在打包前生成一份清单：
+
+    python -m source.manifest
+
+清单位于 resources/manifest/<资源目录名>.json，内容为
+    名称 -> 类型（frames/image）、按帧序号排列的文件。
+存在清单时加载器直接使用清单，不再遍历目录。资源有改动后需要重新生成。
+图片尺寸、透明通道和是否高清不记录在清单中：裁剪缩放总要先解码图片，解码后直接读取即可，
+命中派生帧磁盘缓存（见 source/frame_cache.py）时则连解码也不需要。
+"""
+
+import os
+import json
+import time
+
+MANIFEST_VERSION = 1
+SOURCE_DIRS = ('graphics', 'origin_graphics')
+
+
+def get_manifest_path(directory):
+    """资源目录对应的清单文件，例如 resources/graphics -> resources/manifest/graphics.json"""
+    directory = os.path.normpath(directory)
+    root = os.path.dirname(directory)
+    return os.path.join(root, 'manifest', os.path.basename(directory) + '.json')
+
+
+def load_manifest(directory):
+    """读取资源目录的清单
+
+    Returns:
+        dict: 清单内容；没有生成过或版本不符时返回 None
+    """
+    path = get_manifest_path(directory)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def build_manifest(directory):
+    """遍历资源目录生成清单并写入文件
+
+    Returns:
+        dict: 清单内容
+    """
+    from . import tool
+
+    accept = ('.png', '.jpg', '.bmp', '.gif')
+    assets = {}
+    for name, (kind, path) in sorted(tool.index_all_gfx(directory, accept).items()):
+        if kind == 'frames':
+            files = tool.list_image_frames(path, name, accept)
+        else:
+            files = [path]
+        assets[name] = {
+            'kind': kind,
+            'files': [os.path.relpath(file, directory).replace(os.sep, '/') for file in files],
+        }
+
+    manifest = {'version': MANIFEST_VERSION, 'assets': assets}
+    path = get_manifest_path(directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    return manifest
+
+
+def main():
+    from .resource_path import resource_path
+
+    for name in SOURCE_DIRS:
+        start = time.time()
+        manifest = build_manifest(resource_path('resources', name))
+        frame_num = sum(len(entry['files']) for entry in manifest['assets'].values())
+        print(f'{name}: {len(manifest["assets"])} assets, {frame_num} files '
+              f'({time.time() - start:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
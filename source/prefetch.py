@@ -0,0 +1,199 @@
+"""
+关卡资源预取
+
+登录页和 Loading 页停留期间主线程大部分时间空闲。这里读取即将进入的关卡配置
+（level_<LEVEL_NUM>.json），推算出关卡会用到的背景、卡片、植物、子弹和僵尸，
+在每帧限定的时间预算内逐个预热：
+    - 图片文件先提交给解码线程池（tool.LazyGraphics.prefetch），不占用主线程；
+    - 精灵的裁剪/缩放帧通过构造一次对应的精灵写入各自的帧缓存。
+任务在转换单个文件、缩放单帧之间检查时间预算，超时的任务下一帧从中断处继续。
+登录页和 Loading 页共用同一个预取器，进度不会重复。预取的图片被钉住，
+在关卡结束之前不会被内存预算淘汰（见 tool.pinned_graphics）。
+"""
+
+import json
+import time
+import traceback
+from collections import deque
+import pygame as pg
+from . import tool
+from . import constants as c
+from .component import plant, zombie, menubar
+from .resource_path import resource_path
+
+# 植物名 -> 构造函数（只用于预热帧缓存，位置和精灵组无关紧要）
+PLANT_FACTORIES = {
+    c.SUNFLOWER: lambda group: plant.SunFlower(0, 0, group),
+    c.PEASHOOTER: lambda group: plant.PeaShooter(0, 0, group),
+    c.SNOWPEASHOOTER: lambda group: plant.SnowPeaShooter(0, 0, group),
+    c.WALLNUT: lambda group: plant.WallNut(0, 0),
+    c.CHERRYBOMB: lambda group: plant.CherryBomb(0, 0),
+    c.THREEPEASHOOTER: lambda group: plant.ThreePeaShooter(0, 0, [group] * c.GRID_Y_LEN, 0),
+    c.REPEATERPEA: lambda group: plant.RepeaterPea(0, 0, group),
+    c.CHOMPER: lambda group: plant.Chomper(0, 0),
+    c.PUFFSHROOM: lambda group: plant.PuffShroom(0, 0, group),
+    c.POTATOMINE: lambda group: plant.PotatoMine(0, 0),
+    c.SQUASH: lambda group: plant.Squash(0, 0),
+    c.SPIKEWEED: lambda group: plant.Spikeweed(0, 0),
+    c.JALAPENO: lambda group: plant.Jalapeno(0, 0),
+    c.SCAREDYSHROOM: lambda group: plant.ScaredyShroom(0, 0, group),
+    c.SUNSHROOM: lambda group: plant.SunShroom(0, 0, group),
+    c.ICESHROOM: lambda group: plant.IceShroom(0, 0),
+    c.HYPNOSHROOM: lambda group: plant.HypnoShroom(0, 0),
+    c.WALLNUTBOWLING: lambda group: plant.WallNutBowling(0, 0, 0, None),
+    c.REDWALLNUTBOWLING: lambda group: plant.RedWallNutBowling(0, 0),
+}
+
+# 植物发射的子弹
+PLANT_BULLETS = {
+    c.PEASHOOTER: c.BULLET_PEA,
+    c.REPEATERPEA: c.BULLET_PEA,
+    c.THREEPEASHOOTER: c.BULLET_PEA_THREE,
+    c.SNOWPEASHOOTER: c.BULLET_PEA_ICE,
+    c.PUFFSHROOM: c.BULLET_MUSHROOM,
+    c.SCAREDYSHROOM: c.BULLET_MUSHROOM,
+}
+
+# 植物运行中才用到的额外图片
+PLANT_EXTRA_GFX = {
+    c.CHERRYBOMB: [c.CHERRY_BOOM_IMAGE],
+}
+
+ZOMBIE_CLASSES = {
+    c.NORMAL_ZOMBIE: zombie.NormalZombie,
+    c.CONEHEAD_ZOMBIE: zombie.ConeHeadZombie,
+    c.BUCKETHEAD_ZOMBIE: zombie.BucketHeadZombie,
+    c.FLAG_ZOMBIE: zombie.FlagZombie,
+    c.NEWSPAPER_ZOMBIE: zombie.NewspaperZombie,
+}
+
+
+def load_map_data(level_num):
+    file_path = resource_path('source', 'data', 'map', 'level_' + str(level_num) + '.json')
+    with open(file_path) as f:
+        return json.load(f)
+
+
+class LevelPrefetcher():
+    """按每帧时间预算逐步预热某一关的资源"""
+
+    def __init__(self, level_num):
+        self.level_num = level_num
+        self.tasks = deque()
+        self.group = pg.sprite.Group()
+        try:
+            map_data = load_map_data(level_num)
+        except (OSError, ValueError) as e:
+            print(f'Prefetch skipped: {e}')
+            return
+        self.plan_tasks(map_data)
+
+    @property
+    def done(self):
+        return not self.tasks
+
+    def plan_tasks(self, map_data):
+        bar_type = map_data.get(c.CHOOSEBAR_TYPE, c.CHOOSEBAR_STATIC)
+        if bar_type == c.CHOOSEBAR_STATIC:
+            # 选卡面板展示全部卡片，MenuBar 再按默认比例重新创建选中的卡片
+            card_list = menubar.all_card_list
+            card_scales = (0.75, 0.78)
+            bar_images = [c.MENUBAR_BACKGROUND, c.PANEL_BACKGROUND, c.START_BUTTON]
+        else:
+            card_list = menubar.getCardPool(map_data[c.CARD_POOL])
+            card_scales = (0.78,)
+            bar_images = [c.MOVEBAR_BACKGROUND]
+        plant_names = [menubar.plant_name_list[i] for i in card_list]
+        card_names = [menubar.card_name_list[i] for i in card_list]
+
+        zombie_names = [data['name'] for data in map_data.get(c.ZOMBIE_LIST, [])]
+        spawn_config = map_data.get('zombie_spawn_config', {})
+        zombie_names += list(spawn_config.get('spawn_probability', {}).keys())
+        zombie_names = list(dict.fromkeys(zombie_names))
+
+        # 直接使用原图的资源：先全部提交给解码线程池
+        direct_names = [c.BACKGROUND_NAME, c.CAR] + bar_images + card_names
+        if bar_type == c.CHOOSEBAR_STATIC:
+            direct_names += [menubar.ZOMBIE_WALK_FRAMES[name] for name in zombie_names
+                             if name in menubar.ZOMBIE_WALK_FRAMES]
+        for name in plant_names:
+            direct_names += PLANT_EXTRA_GFX.get(name, [])
+        self.tasks.append(lambda: self.prefetch_gfx(tool.GFX, direct_names))
+        # 提示框使用原始尺寸的植物动画
+        self.tasks.append(lambda: self.prefetch_gfx(tool.ORIGIN_GFX, plant_names))
+
+        # 主线程上的转换和裁剪缩放，按进入关卡后用到的先后排列
+        for name in direct_names:
+            if name in tool.GFX:
+                self.tasks.append(lambda name=name: tool.GFX[name])
+        for name in card_names:
+            if name not in tool.GFX:
+                continue
+            for scale in card_scales:
+                self.tasks.append(lambda name=name, scale=scale: menubar.getCardImages(name, scale))
+        for name in zombie_names:
+            if name in ZOMBIE_CLASSES:
+                self.tasks.append(lambda cls=ZOMBIE_CLASSES[name]: cls(0, 0, self.group))
+        if c.HYPNOSHROOM in plant_names:
+            # 被魅惑的僵尸使用翻转帧
+            for name in zombie_names:
+                if name in ZOMBIE_CLASSES:
+                    self.tasks.append(lambda cls=ZOMBIE_CLASSES[name]: cls(0, 0, self.group).loadFlippedFrames())
+        self.tasks.append(lambda: zombie.ZombieHead(0, 0))
+        self.tasks.append(lambda: plant.Sun(0, 0, 0, 0))
+
+        bullet_names = []
+        for name in plant_names:
+            if name in PLANT_FACTORIES:
+                self.tasks.append(lambda name=name: PLANT_FACTORIES[name](self.group))
+            bullet = PLANT_BULLETS.get(name)
+            if bullet and bullet not in bullet_names:
+                bullet_names.append(bullet)
+        for name in bullet_names:
+            self.tasks.append(lambda name=name: plant.Bullet(0, 0, 0, name, c.BULLET_DAMAGE_NORMAL, False))
+        # 拖动卡片时跟随鼠标的图片和种植提示图片
+        for name in plant_names:
+            if name in tool.GFX:
+                self.tasks.append(lambda name=name: plant.getMouseImages(name))
+        for name in plant_names:
+            if name in tool.ORIGIN_GFX:
+                self.tasks.append(lambda name=name: tool.ORIGIN_GFX[name])
+
+    def prefetch_gfx(self, graphics, names):
+        for name in names:
+            if name in graphics:
+                graphics.prefetch(name)
+
+    def step(self, budget_ms=c.PREFETCH_FRAME_BUDGET):
+        """执行预取任务直到用完本帧的时间预算
+
+        任务在解码转换单个文件、缩放单帧等工作之间检查时限（见 tool.run_with_deadline），
+        超时的任务留到下一帧继续。等待解码线程池的任务也会让出本帧。
+
+        Returns:
+            bool: 全部任务是否已完成
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        while self.tasks and time.perf_counter() < deadline:
+            try:
+                with tool.pinned_graphics():
+                    if not tool.run_with_deadline(self.tasks[0], deadline):
+                        break
+            except Exception:
+                # 预取只是优化，任何失败都只跳过这个任务，进入关卡时会按原流程加载并报告
+                print('Prefetch failed:')
+                traceback.print_exc()
+            self.tasks.popleft()
+        self.group.empty()
+        return self.done
+
+
+_PREFETCHERS = {}
+
+def get_prefetcher(level_num):
+    """获取某一关的预取器，同一关在登录页和 Loading 页之间共用进度"""
+    prefetcher = _PREFETCHERS.get(level_num)
+    if prefetcher is None:
+        prefetcher = LevelPrefetcher(level_num)
+        _PREFETCHERS[level_num] = prefetcher
+    return prefetcher
@@ -73,8 +73,13 @@ class CrazyModeSpawner:
 
 
 class Level(tool.State):
+    # 背景类型 -> (视口内的背景, 背景图 rect, 视口)，重新开始同类型的关卡时不再缩放和裁剪
+    _BACKGROUND_CACHE = {}
+
     def __init__(self):
         tool.State.__init__(self)
+        # 关卡运行期间用到的图片常驻内存，结束后才按预算淘汰
+        self.pin_graphics = True
     
     def startup(self, current_time, persist):
         import time
@@ -83,6 +88,8 @@ class Level(tool.State):
         self.persist = self.game_info
         self.game_info[c.CURRENT_TIME] = current_time
         self.map_y_len = c.GRID_Y_LEN
+        # 脏矩形模式下上一帧画过的区域，None 表示下一帧整屏重绘
+        self.drawn_rects = None
         self.map = map.Map(c.GRID_X_LEN, self.map_y_len)
         self._collide_ratio = {
             0.6: pg.sprite.collide_circle_ratio(0.6),
@@ -151,6 +158,18 @@ class Level(tool.State):
     def setupBackground(self):
         img_index = self.map_data[c.BACKGROUND_TYPE]
         self.background_type = img_index
+        cached = Level._BACKGROUND_CACHE.get(img_index)
+        if cached is None:
+            cached = self.createBackground(img_index)
+            Level._BACKGROUND_CACHE[img_index] = cached
+        self.background, self.bg_rect, self.viewport = cached
+
+    def createBackground(self, img_index):
+        """缩放背景图并裁剪出视口范围，转换为屏幕像素格式，每帧直接 blit 到屏幕
+
+        Returns:
+            tuple: (视口内的背景, 缩放后整张背景图的 rect, 视口在背景图中的位置)
+        """
         bg = tool.GFX[c.BACKGROUND_NAME][img_index]
 
         # 检测是否为高清背景图
@@ -162,21 +181,24 @@ class Level(tool.State):
             # 高清图：缩放到与低清图相同的目标尺寸
             target_width = int(c.BASE_BACKGROUND_REF_WIDTH * c.ASSET_SCALE)
             target_height = int(c.BASE_BACKGROUND_REF_HEIGHT * c.ASSET_SCALE)
-            self.background = pg.transform.smoothscale(bg, (target_width, target_height))
+            background = pg.transform.smoothscale(bg, (target_width, target_height))
         elif c.ASSET_SCALE != 1:
             # 低清图：按 ASSET_SCALE 缩放
-            self.background = pg.transform.scale(
+            background = pg.transform.scale(
                 bg,
                 (int(bg.get_width() * c.ASSET_SCALE), int(bg.get_height() * c.ASSET_SCALE))
             )
         else:
-            self.background = bg
-        self.bg_rect = self.background.get_rect()
+            background = bg
+        bg_rect = background.get_rect()
+
+        viewport = tool.SCREEN.get_rect(bottom=bg_rect.bottom)
+        viewport.x += c.BACKGROUND_OFFSET_X
+        # 超出背景图的部分保持黑色
+        image = tool.convert_display(pg.Surface(viewport.size))
+        image.blit(background, (0, 0), viewport)
+        return image, bg_rect, viewport
 
-        self.level = pg.Surface((self.bg_rect.w, self.bg_rect.h)).convert()
-        self.viewport = tool.SCREEN.get_rect(bottom=self.bg_rect.bottom)
-        self.viewport.x += c.BACKGROUND_OFFSET_X
-    
     def setupGroups(self):
         self.sun_group = pg.sprite.Group()
         self.head_group = pg.sprite.Group()
@@ -224,7 +246,9 @@ class Level(tool.State):
         elif self.state == c.PLAY:
             self.play(mouse_pos, mouse_click, mouse_hover_pos)
 
-        self.draw(surface)
+        # 只运行逻辑时 surface 为 None
+        if surface is not None:
+            self.draw(surface)
 
     def initBowlingMap(self):
         print('initBowlingMap')
@@ -471,13 +495,8 @@ class Level(tool.State):
             if (self.hint_image and pos[0] == self.hint_rect.x and
                 pos[1] == self.hint_rect.y):
                 return
-            width, height = self.mouse_rect.w, self.mouse_rect.h
-            image = pg.Surface([width, height])
-            image.blit(self.mouse_image, (0, 0), (0, 0, width, height))
-            image.set_colorkey(c.BLACK)
-            image.set_alpha(128)
-            self.hint_image = image
-            self.hint_rect = image.get_rect()
+            self.hint_image = self.mouse_hint_image
+            self.hint_rect = self.hint_image.get_rect()
             self.hint_rect.centerx = pos[0]
             self.hint_rect.bottom = pos[1]
             self.hint_plant = True
@@ -485,71 +504,7 @@ class Level(tool.State):
             self.hint_plant = False
 
     def setupMouseImage(self, plant_name, select_plant):
-        frame_list = tool.GFX[plant_name]
-        if plant_name in tool.PLANT_RECT:
-            data = tool.PLANT_RECT[plant_name]
-            x, y, width, height = data['x'], data['y'], data['width'], data['height']
-        else:
-            x, y = 0, 0
-            min_w = min(f.get_rect().w for f in frame_list)
-            min_h = min(f.get_rect().h for f in frame_list)
-            width, height = min_w, min_h
-
-        if (plant_name == c.SCAREDYSHROOM or plant_name == c.SUNSHROOM or
-            plant_name == c.ICESHROOM or plant_name == c.HYPNOSHROOM or
-            plant_name == c.WALLNUTBOWLING or plant_name == c.REDWALLNUTBOWLING):
-            color = c.WHITE
-        else:
-            color = c.BLACK
-
-        # 为倭瓜和食人花设置缩放比例
-        if plant_name == c.SQUASH:
-            scale = 0.5
-        elif plant_name == c.CHOMPER:
-            scale = 0.85
-        elif plant_name == c.SNOWPEASHOOTER:
-            scale = 0.95
-        elif plant_name == c.PEASHOOTER:
-            scale = 0.95
-        elif plant_name == c.REPEATERPEA:
-            scale = 1.1
-        elif plant_name == c.WALLNUT:
-            scale = 1.1
-        elif plant_name == c.SUNFLOWER:
-            scale = 0.88
-        elif plant_name == c.THREEPEASHOOTER:
-            scale = 0.85
-        elif plant_name == c.CHERRYBOMB:
-            scale = 0.85
-        elif plant_name == c.POTATOMINE:
-            scale = 1
-        elif plant_name == c.SPIKEWEED:
-            scale = 1
-        elif plant_name == c.JALAPENO:
-            scale = 1
-        else:
-            scale = 0.75
-
-        frame = frame_list[0]
-        actual_rect = frame.get_rect()
-        actual_w, actual_h = actual_rect.w, actual_rect.h
-        expected_w = x + width
-        expected_h = y + height
-        is_hd = (actual_w > expected_w * 2 or actual_h > expected_h * 2)
-
-        if is_hd:
-            hd_ratio = actual_w / expected_w if expected_w > 0 else 1
-            scaled_x = int(x * hd_ratio)
-            scaled_y = int(y * hd_ratio)
-            crop_width = int(width * hd_ratio)
-            crop_height = int(height * hd_ratio)
-            target_width = int(width * scale * c.ASSET_SCALE)
-            target_height = int(height * scale * c.ASSET_SCALE)
-            self.mouse_image = tool.get_image_fit(
-                frame, scaled_x, scaled_y, crop_width, crop_height, color,
-                target_width=target_width, target_height=target_height)
-        else:
-            self.mouse_image = tool.get_image(frame, x, y, width, height, color, scale)
+        self.mouse_image, self.mouse_hint_image = plant.getMouseImages(plant_name)
         self.mouse_rect = self.mouse_image.get_rect()
         pg.mouse.set_visible(False)
         self.drag_plant = True
@@ -838,8 +793,13 @@ class Level(tool.State):
             zombie.drawFreezeTrap(surface)
 
     def draw(self, surface):
-        self.level.blit(self.background, self.viewport, self.viewport)
-        surface.blit(self.level, (0,0), self.viewport)
+        # 脏矩形模式：只用背景擦除上一帧画过的区域，其余区域保持干净的背景
+        dirty_mode = c.DIRTY_RECT_RENDERING and self.state == c.PLAY
+        if dirty_mode and self.drawn_rects is not None:
+            for rect in self.drawn_rects:
+                surface.blit(self.background, rect, rect)
+        else:
+            surface.blit(self.background, (0, 0))
         if self.state == c.CHOOSE:
             self.panel.draw(surface)
         elif self.state == c.PLAY:
@@ -872,3 +832,41 @@ class Level(tool.State):
 
             # 最后绘制 tooltip，确保显示在最上层
             self.menubar.drawTooltip(surface)
+
+        if dirty_mode:
+            drawn_rects = self.getDrawnRects(surface)
+            # 窗口需要刷新上一帧和本帧画过的区域；第一帧整屏刷新
+            if self.drawn_rects is None:
+                self.dirty_rects = None
+            else:
+                # 位置不变的植物栏、分数等区域只需刷新一次
+                self.dirty_rects = list({tuple(rect): rect for rect in
+                                         self.drawn_rects + drawn_rects}.values())
+            self.drawn_rects = drawn_rects
+        else:
+            self.drawn_rects = None
+            self.dirty_rects = None
+
+    def getDrawnRects(self, surface):
+        """本帧画过的全部区域（已裁剪到屏幕内），下一帧用背景擦除"""
+        rects = list(self.menubar.drawn_rects)
+        for i in range(self.map_y_len):
+            for group in (self.plant_groups[i], self.zombie_groups[i],
+                          self.hypno_zombie_groups[i], self.bullet_groups[i]):
+                rects.extend(group.spritedict.values())
+            for sprite in self.zombie_groups[i]:
+                if sprite.state == c.FREEZE:
+                    rects.append(sprite.ice_trap_rect)
+        for car in self.cars:
+            rects.append(car.rect)
+        rects.extend(self.head_group.spritedict.values())
+        rects.extend(self.sun_group.spritedict.values())
+        if self.drag_plant:
+            if self.hint_plant:
+                rects.append(self.hint_rect)
+            rects.append(self.mouse_rect)
+        # clip 同时生成副本，精灵的 rect 之后会被移动
+        screen_rect = surface.get_rect()
+        rects = (screen_rect.clip(rect) for rect in rects if rect)
+        rects = {tuple(rect): rect for rect in rects if rect}
+        return list(rects.values())
@@ -1,8 +1,11 @@
 __author__ = 'marble_xu'
 
+import math
 import pygame as pg
 from .. import tool
 from .. import constants as c
+from .. import fonts
+from .. import prefetch
 from ..language import LANG
 
 
@@ -37,6 +40,7 @@ class LoadingScreen(tool.State):
             LANG.get('loading_story_3'),
             LANG.get('loading_story_4'),
         ]
+        self.prepare_layouts()
 
     def update(self, surface, current_time, mouse_pos, mouse_click, events, mouse_hover_pos=None):
         self.current_time = current_time
@@ -76,8 +80,12 @@ class LoadingScreen(tool.State):
         if self.alpha < self.max_alpha:
             self.alpha = min(self.max_alpha, self.alpha + self.fade_in_speed)
 
-        # 绘制页面
-        self.draw(surface)
+        # 绘制页面（只运行逻辑时 surface 为 None）
+        if surface is not None:
+            self.draw(surface)
+
+        # 故事播放期间预取即将进入的关卡资源
+        prefetch.get_prefetcher(self.game_info[c.LEVEL_NUM]).step()
 
     def wrap_text(self, text, font, max_width):
         """
@@ -110,32 +118,18 @@ class LoadingScreen(tool.State):
 
         return lines
 
-    def draw(self, surface):
-        """绘制 Loading 页面"""
-        # 填充黑色背景
-        surface.fill(c.BLACK)
-
-        # 获取当前故事文本（中英双语）
-        if self.current_story_index < len(self.stories):
-            # 保存当前语言
-            original_lang = LANG.get_current_language()
+    def prepare_layouts(self):
+        """预先排版全部故事（中英双语）和跳过提示，draw 时只调整透明度并 blit"""
+        # 使用更清晰美观的字体：微软雅黑（中文）和 Segoe UI（英文）
+        zh_font = fonts.get_font('Microsoft YaHei', c.scale(28), bold=True)  # 中文使用微软雅黑，加粗
+        en_font = fonts.get_font('Segoe UI', c.scale(20), italic=True)  # 英文使用 Segoe UI 斜体
+        max_width = c.SCREEN_WIDTH - c.scale(100)  # 左右各留50像素边距
 
-            # 获取中文文本
-            LANG.set_language(c.LANGUAGE_ZH_CN)
-            zh_text = LANG.get(f'loading_story_{self.current_story_index + 1}')
-
-            # 获取英文文本
-            LANG.set_language(c.LANGUAGE_EN_US)
-            en_text = LANG.get(f'loading_story_{self.current_story_index + 1}')
-
-            # 恢复原语言
-            LANG.set_language(original_lang)
-
-            # 文本自动换行处理
-            # 使用更清晰美观的字体：微软雅黑（中文）和 Segoe UI（英文）
-            zh_font = pg.font.SysFont('Microsoft YaHei', c.scale(28), bold=True)  # 中文使用微软雅黑，加粗
-            en_font = pg.font.SysFont('Segoe UI', c.scale(20), italic=True)  # 英文使用 Segoe UI 斜体
-            max_width = c.SCREEN_WIDTH - c.scale(100)  # 左右各留50像素边距
+        self.story_layouts = []
+        for index in range(len(self.stories)):
+            key = f'loading_story_{index + 1}'
+            zh_text = LANG.get_for_language(c.LANGUAGE_ZH_CN, key)
+            en_text = LANG.get_for_language(c.LANGUAGE_EN_US, key)
 
             # 将文本分割成多行
             zh_lines = self.wrap_text(zh_text, zh_font, max_width)
@@ -152,29 +146,53 @@ class LoadingScreen(tool.State):
             # 起始Y坐标（居中）
             start_y = (c.SCREEN_HEIGHT - total_height) // 2
 
-            # 绘制中文文字
+            # 中文文字
+            layout = []
             y_offset = start_y
-            for i, line in enumerate(zh_lines):
+            for line in zh_lines:
                 text_surface = zh_font.render(line, True, c.WHITE)
-                text_surface.set_alpha(self.alpha)
                 text_rect = text_surface.get_rect()
                 text_rect.centerx = c.SCREEN_WIDTH // 2
                 text_rect.y = y_offset
-                surface.blit(text_surface, text_rect)
+                layout.append((text_surface, text_rect))
                 y_offset += zh_line_height
 
             # 添加间距
             y_offset += spacing
 
-            # 绘制英文文字（浅灰色斜体，与中文形成层次）
-            for i, line in enumerate(en_lines):
+            # 英文文字（浅灰色斜体，与中文形成层次）
+            for line in en_lines:
                 text_surface = en_font.render(line, True, (200, 200, 210))
-                text_surface.set_alpha(self.alpha)
                 text_rect = text_surface.get_rect()
                 text_rect.centerx = c.SCREEN_WIDTH // 2
                 text_rect.y = y_offset
-                surface.blit(text_surface, text_rect)
+                layout.append((text_surface, text_rect))
                 y_offset += en_line_height
+            self.story_layouts.append(layout)
+
+        # 跳过提示：背景条和文字只渲染一次，闪烁时只改透明度
+        skip_text = "Click to skip"
+        skip_font = fonts.get_font('Arial', c.scale(18))
+        self.skip_bg_rect = pg.Rect(0, c.SCREEN_HEIGHT - c.scale(40), c.SCREEN_WIDTH, c.scale(35))
+        self.skip_bg = pg.Surface((self.skip_bg_rect.width, self.skip_bg_rect.height))
+        self.skip_bg.fill((30, 30, 40))
+        self.skip_bg.set_alpha(180)
+        # 文字描边效果（让文字更清晰）
+        self.skip_outline = skip_font.render(skip_text, True, (60, 60, 80))
+        self.skip_surface = skip_font.render(skip_text, True, (220, 220, 230))
+        self.skip_text_width = skip_font.size(skip_text)[0]
+
+    def draw(self, surface):
+        """绘制 Loading 页面"""
+        # 填充黑色背景
+        surface.fill(c.BLACK)
+
+        if self.current_story_index < len(self.stories):
+            # 绘制当前故事文字（中英双语），逐渐显现
+            for text_surface, text_rect in self.story_layouts[self.current_story_index]:
+                if text_surface.get_alpha() != self.alpha:
+                    text_surface.set_alpha(self.alpha)
+                surface.blit(text_surface, text_rect)
 
             # 绘制进度指示器（小点点）
             dot_y = c.SCREEN_HEIGHT - c.scale(50)
@@ -199,52 +217,35 @@ class LoadingScreen(tool.State):
 
     def draw_skip_hint(self, surface):
         """绘制跳过提示 - 更显眼的样式"""
-        skip_text = "Click to skip"
-
-        # 使用清晰的字体
-        skip_font = pg.font.SysFont('Arial', c.scale(18))
-
         # 计算闪烁效果（使用正弦波实现平滑闪烁）
-        import math
         pulse = (math.sin(self.current_time / 300) + 1) / 2  # 0 到 1 之间
         alpha = int(150 + 105 * pulse)  # 150 到 255 之间
 
         # 绘制半透明背景条
-        text_width = skip_font.size(skip_text)[0]
-        bg_rect = pg.Rect(0, c.SCREEN_HEIGHT - c.scale(40), c.SCREEN_WIDTH, c.scale(35))
-        bg_surface = pg.Surface((bg_rect.width, bg_rect.height))
-        bg_surface.fill((30, 30, 40))
-        bg_surface.set_alpha(180)
-        surface.blit(bg_surface, bg_rect)
-
-        # 绘制文字描边效果（让文字更清晰）
-        outline_color = (60, 60, 80)
-        text_color = (220, 220, 230)
+        surface.blit(self.skip_bg, self.skip_bg_rect)
 
         # 绘制描边
+        self.skip_outline.set_alpha(alpha)
         outline_offset = c.scale(1)
         for dx in [-outline_offset, 0, outline_offset]:
             for dy in [-outline_offset, 0, outline_offset]:
                 if dx != 0 or dy != 0:
-                    outline_surface = skip_font.render(skip_text, True, outline_color)
-                    outline_surface.set_alpha(alpha)
-                    outline_rect = outline_surface.get_rect()
+                    outline_rect = self.skip_outline.get_rect()
                     outline_rect.centerx = c.SCREEN_WIDTH // 2 + dx
                     outline_rect.centery = c.SCREEN_HEIGHT - c.scale(22) + dy
-                    surface.blit(outline_surface, outline_rect)
+                    surface.blit(self.skip_outline, outline_rect)
 
         # 绘制主文字
-        skip_surface = skip_font.render(skip_text, True, text_color)
-        skip_surface.set_alpha(alpha)
-        skip_rect = skip_surface.get_rect()
+        self.skip_surface.set_alpha(alpha)
+        skip_rect = self.skip_surface.get_rect()
         skip_rect.centerx = c.SCREEN_WIDTH // 2
         skip_rect.centery = c.SCREEN_HEIGHT - c.scale(22)
-        surface.blit(skip_surface, skip_rect)
+        surface.blit(self.skip_surface, skip_rect)
 
         # 绘制两侧装饰线条
         line_y = c.SCREEN_HEIGHT - c.scale(22)
         line_length = c.scale(60)
-        gap = text_width // 2 + c.scale(20)
+        gap = self.skip_text_width // 2 + c.scale(20)
 
         # 左侧线条
         pg.draw.line(surface, (100, 100, 120),
@@ -3,6 +3,8 @@ __author__ = 'marble_xu'
 import pygame as pg
 from .. import tool
 from .. import constants as c
+from .. import fonts
+from .. import prefetch
 from ..language import LANG
 from ..network import NETWORK
 
@@ -62,6 +64,10 @@ class LoginScreen(tool.State):
         self.settings_save_button_rect = pg.Rect(c.scale(320), c.scale(310), c.scale(120), c.scale(40))
         self.settings_cancel_button_rect = pg.Rect(c.scale(460), c.scale(310), c.scale(120), c.scale(40))
 
+        # 静态图层：名称 -> Surface，语言切换后重新绘制
+        self.layers = {}
+        self.layer_language = None
+
         # 加载背景图片
         self.background = None
         self.load_background()
@@ -132,8 +138,12 @@ class LoginScreen(tool.State):
         if self.settings_message and current_time - self.settings_message_time > 2000:
             self.settings_message = ''
 
-        # 绘制页面
-        self.draw(surface)
+        # 绘制页面（只运行逻辑时 surface 为 None）
+        if surface is not None:
+            self.draw(surface, current_time)
+
+        # 登录后固定进入疯狂模式关卡，利用空闲时间预取关卡资源
+        prefetch.get_prefetcher(c.CRAZY_LEVEL_NUM).step()
 
     def update_cursor(self, mouse_hover_pos):
         """根据鼠标位置更新光标样式"""
@@ -161,9 +171,9 @@ class LoginScreen(tool.State):
                     is_on_clickable = True
 
             if is_on_clickable:
-                pg.mouse.set_cursor(pg.SYSTEM_CURSOR_HAND)
+                tool.set_cursor(pg.SYSTEM_CURSOR_HAND)
             else:
-                pg.mouse.set_cursor(pg.SYSTEM_CURSOR_ARROW)
+                tool.set_cursor(pg.SYSTEM_CURSOR_ARROW)
 
     def handle_input(self, events):
         """处理键盘输入"""
@@ -363,7 +373,7 @@ class LoginScreen(tool.State):
 
         # 设置游戏模式信息（原本在主菜单中设置）
         self.game_info['is_crazy_mode'] = True
-        self.game_info[c.LEVEL_NUM] = 'crazy'
+        self.game_info[c.LEVEL_NUM] = c.CRAZY_LEVEL_NUM
 
         # 进入 Loading 页面
         self.done = True
@@ -377,8 +387,66 @@ class LoginScreen(tool.State):
         else:
             LANG.set_language(c.LANGUAGE_ZH_CN)
 
-    def draw(self, surface):
-        """绘制登录页面 - PVZ风格"""
+    def get_layer(self, name):
+        """获取静态图层，语言切换后重新绘制
+
+        'main' 为不透明的整屏画面（背景、面板、标题、标签、输入框、按钮），
+        'settings' 为带半透明遮罩的设置弹窗，叠加在主画面之上。
+        """
+        language = LANG.get_current_language()
+        if self.layer_language != language:
+            self.layers.clear()
+            self.layer_language = language
+        layer = self.layers.get(name)
+        if layer is None:
+            if name == 'main':
+                layer = pg.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+                self.draw_main_layer(layer)
+            else:
+                layer = pg.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT), pg.SRCALPHA)
+                self.draw_settings_layer(layer)
+            self.layers[name] = layer
+        return layer
+
+    def draw(self, surface, current_time):
+        """绘制登录页面 - PVZ风格
+
+        面板、标签和按钮画在静态图层里，每帧只绘制输入的文字、光标和临时提示。
+        """
+        surface.blit(self.get_layer('main'), (0, 0))
+
+        # 绘制输入文字和光标
+        self.draw_input_text(surface, self.name_input_rect, self.name_text,
+                             self.active_input == 'name' and not self.show_settings,
+                             current_time)
+        self.draw_input_text(surface, self.id_input_rect, self.employee_id_text,
+                             self.active_input == 'employee_id' and not self.show_settings,
+                             current_time)
+
+        # 绘制离线模式提示
+        if self.is_offline:
+            self.draw_outlined_text(surface, LANG.get('login_offline_mode'),
+                                   c.SCREEN_WIDTH // 2, self.panel_y + self.panel_height + c.scale(30),
+                                   22, c.ORANGE, PVZ_BROWN_DARK)
+
+        # 绘制错误消息
+        if self.error_message:
+            self.draw_outlined_text(surface, self.error_message,
+                                   c.SCREEN_WIDTH // 2, self.panel_y + c.scale(235),
+                                   18, c.ORANGE, PVZ_BROWN_DARK)
+
+        # 绘制连接提示
+        if self.connecting:
+            self.draw_outlined_text(surface, LANG.get('login_connecting'),
+                                   c.SCREEN_WIDTH // 2, self.panel_y + self.panel_height + c.scale(30),
+                                   22, c.WHITE, PVZ_BROWN_DARK)
+
+        # 绘制设置弹窗
+        if self.show_settings:
+            self.draw_settings_panel(surface, current_time)
+
+    def draw_main_layer(self, surface):
+        """绘制登录页面的静态部分"""
         # 绘制背景图片
         if self.background:
             surface.blit(self.background, (0, 0))
@@ -402,21 +470,19 @@ class LoginScreen(tool.State):
                                26, PVZ_YELLOW, PVZ_BROWN_DARK)
 
         # 绘制姓名标签
-        label_font = pg.font.SysFont('SimHei', c.scale(22))
+        label_font = fonts.get_font('SimHei', c.scale(22))
         name_label = label_font.render(LANG.get('login_name'), True, PVZ_CREAM)
         surface.blit(name_label, (self.panel_x + c.scale(60), self.panel_y + c.scale(90)))
 
-        # 绘制姓名输入框 - PVZ风格
-        self.draw_pvz_input_box(surface, self.name_input_rect, self.name_text,
-                               self.active_input == 'name' and not self.show_settings)
+        # 绘制姓名输入框 - PVZ风格（选中时的金色边框在 draw_input_text 中绘制）
+        self.draw_pvz_input_box(surface, self.name_input_rect, False)
 
         # 绘制工号标签
         id_label = label_font.render(LANG.get('login_employee_id'), True, PVZ_CREAM)
         surface.blit(id_label, (self.panel_x + c.scale(60), self.panel_y + c.scale(160)))
 
         # 绘制工号输入框 - PVZ风格
-        self.draw_pvz_input_box(surface, self.id_input_rect, self.employee_id_text,
-                               self.active_input == 'employee_id' and not self.show_settings)
+        self.draw_pvz_input_box(surface, self.id_input_rect, False)
 
         # 绘制登录按钮 - PVZ木质按钮风格
         self.draw_pvz_button(surface, self.login_button_rect,
@@ -430,33 +496,11 @@ class LoginScreen(tool.State):
         self.draw_small_button(surface, self.language_button_rect,
                               LANG.get('login_switch_language'))
 
-        # 绘制离线模式提示
-        if self.is_offline:
-            self.draw_outlined_text(surface, LANG.get('login_offline_mode'),
-                                   c.SCREEN_WIDTH // 2, self.panel_y + self.panel_height + c.scale(30),
-                                   22, c.ORANGE, PVZ_BROWN_DARK)
-
-        # 绘制错误消息
-        if self.error_message:
-            self.draw_outlined_text(surface, self.error_message,
-                                   c.SCREEN_WIDTH // 2, self.panel_y + c.scale(235),
-                                   18, c.ORANGE, PVZ_BROWN_DARK)
-
-        # 绘制连接提示
-        if self.connecting:
-            self.draw_outlined_text(surface, LANG.get('login_connecting'),
-                                   c.SCREEN_WIDTH // 2, self.panel_y + self.panel_height + c.scale(30),
-                                   22, c.WHITE, PVZ_BROWN_DARK)
-
-        # 绘制设置弹窗
-        if self.show_settings:
-            self.draw_settings_panel(surface)
-
     def draw_wood_panel(self, surface, x, y, width, height):
         """绘制木质面板"""
         # 外层阴影
         shadow_rect = pg.Rect(x + c.scale(6), y + c.scale(6), width, height)
-        pg.draw.rect(surface, (0, 0, 0, 100), shadow_rect, border_radius=c.scale(15))
+        pg.draw.rect(surface, (0, 0, 0), shadow_rect, border_radius=c.scale(15))
 
         # 主面板背景 - 深棕色
         panel_rect = pg.Rect(x, y, width, height)
@@ -488,7 +532,7 @@ class LoginScreen(tool.State):
                            (x + c.scale(20), line_y),
                            (x + width - c.scale(20), line_y), c.scale(1))
 
-    def draw_pvz_input_box(self, surface, rect, text, active):
+    def draw_pvz_input_box(self, surface, rect, active):
         """绘制PVZ风格的输入框"""
         box_rect = pg.Rect(rect)
 
@@ -503,10 +547,15 @@ class LoginScreen(tool.State):
         border_color = PVZ_YELLOW if active else PVZ_BROWN
         pg.draw.rect(surface, border_color, box_rect, c.scale(3), border_radius=c.scale(8))
 
+    def draw_input_text(self, surface, rect, text, active, current_time):
+        """在静态图层的输入框上绘制文字和光标，选中的输入框改用金色边框"""
+        if active:
+            pg.draw.rect(surface, PVZ_YELLOW, pg.Rect(rect), c.scale(3), border_radius=c.scale(8))
+
         # 文字
-        font = pg.font.SysFont('SimHei', c.scale(22))
+        font = fonts.get_font('SimHei', c.scale(22))
         if text:
-            text_surface = font.render(text, True, PVZ_BROWN_DARK)
+            text_surface = fonts.render_text(font, text, PVZ_BROWN_DARK)
             text_rect = text_surface.get_rect()
             text_rect.midleft = (rect[0] + c.scale(12), rect[1] + rect[3] // 2)
             surface.blit(text_surface, text_rect)
@@ -519,7 +568,7 @@ class LoginScreen(tool.State):
             cursor_rect = pg.Rect(cursor_x, rect[1] + c.scale(8),
                                   c.scale(2), rect[3] - c.scale(16))
             # 闪烁效果
-            if (pg.time.get_ticks() // 500) % 2 == 0:
+            if (current_time // 500) % 2 == 0:
                 pg.draw.rect(surface, PVZ_BROWN_DARK, cursor_rect)
 
     def draw_pvz_button(self, surface, rect, text, base_color, font_size):
@@ -559,7 +608,7 @@ class LoginScreen(tool.State):
         pg.draw.rect(surface, PVZ_YELLOW, rect, c.scale(2), border_radius=c.scale(5))
 
         # 文字
-        font = pg.font.SysFont('SimHei', c.scale(12))
+        font = fonts.get_font('SimHei', c.scale(12))
         text_surface = font.render(text, True, PVZ_CREAM)
         text_rect = text_surface.get_rect(center=rect.center)
         surface.blit(text_surface, text_rect)
@@ -567,14 +616,14 @@ class LoginScreen(tool.State):
     def draw_outlined_text(self, surface, text, x, y, size, color, outline_color):
         """绘制带描边的文字"""
         scaled_size = c.scale(size)
-        font = pg.font.SysFont('SimHei', scaled_size, bold=True)
+        font = fonts.get_font('SimHei', scaled_size, bold=True)
         outline_offset = c.scale(2)
 
         # 绘制描边（8个方向）
+        outline_surface = font.render(text, True, outline_color)
         for dx in [-outline_offset, 0, outline_offset]:
             for dy in [-outline_offset, 0, outline_offset]:
                 if dx != 0 or dy != 0:
-                    outline_surface = font.render(text, True, outline_color)
                     outline_rect = outline_surface.get_rect(center=(x + dx, y + dy))
                     surface.blit(outline_surface, outline_rect)
 
@@ -583,13 +632,24 @@ class LoginScreen(tool.State):
         text_rect = text_surface.get_rect(center=(x, y))
         surface.blit(text_surface, text_rect)
 
-    def draw_settings_panel(self, surface):
+    def draw_settings_panel(self, surface, current_time):
         """绘制设置弹窗 - PVZ风格"""
+        surface.blit(self.get_layer('settings'), (0, 0))
+
+        # 服务器地址
+        self.draw_input_text(surface, self.settings_url_input_rect,
+                             self.settings_server_url, True, current_time)
+
+        # 显示测试/保存消息
+        if self.settings_message:
+            self.draw_outlined_text(surface, self.settings_message,
+                                   self.settings_panel_rect.centerx, c.scale(365),
+                                   16, self.settings_message_color, PVZ_BROWN_DARK)
+
+    def draw_settings_layer(self, surface):
+        """绘制设置弹窗的静态部分（透明图层）"""
         # 半透明遮罩
-        overlay = pg.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+        surface.fill((0, 0, 0, 150))
 
         # 木质弹窗面板
         self.draw_wood_panel(surface, self.settings_panel_rect.x, self.settings_panel_rect.y,
@@ -601,13 +661,12 @@ class LoginScreen(tool.State):
                                28, PVZ_YELLOW, PVZ_BROWN_DARK)
 
         # 服务器地址标签
-        label_font = pg.font.SysFont('SimHei', c.scale(18))
+        label_font = fonts.get_font('SimHei', c.scale(18))
         url_label = label_font.render(LANG.get('settings_server_url'), True, PVZ_CREAM)
         surface.blit(url_label, (c.scale(180), c.scale(210)))
 
         # 服务器地址输入框 - PVZ风格
-        self.draw_pvz_input_box(surface, self.settings_url_input_rect,
-                               self.settings_server_url, True)
+        self.draw_pvz_input_box(surface, self.settings_url_input_rect, True)
 
         # 测试按钮
         self.draw_pvz_button(surface, self.settings_test_button_rect,
@@ -620,9 +679,3 @@ class LoginScreen(tool.State):
         # 取消按钮
         self.draw_pvz_button(surface, self.settings_cancel_button_rect,
                             LANG.get('settings_cancel'), (139, 90, 43), 16)
-
-        # 显示测试/保存消息
-        if self.settings_message:
-            self.draw_outlined_text(surface, self.settings_message,
-                                   self.settings_panel_rect.centerx, c.scale(365),
-                                   16, self.settings_message_color, PVZ_BROWN_DARK)
@@ -50,7 +50,7 @@ class Menu(tool.State):
             self.option_timer = self.option_start = self.current_time
             # 设置疯狂模式标志，使用特殊关卡名
             self.game_info['is_crazy_mode'] = True
-            self.game_info[c.LEVEL_NUM] = 'crazy'
+            self.game_info[c.LEVEL_NUM] = c.CRAZY_LEVEL_NUM
             print(f'[DEBUG] Option clicked at time={self.current_time}')
         return False
         
@@ -70,5 +70,6 @@ class Menu(tool.State):
             if(self.current_time - self.option_start) > 500:
                 self.done = True
 
-        surface.blit(self.bg_image, self.bg_rect)
-        surface.blit(self.option_image, self.option_rect)
+        if surface is not None:
+            surface.blit(self.bg_image, self.bg_rect)
+            surface.blit(self.option_image, self.option_rect)
@@ -4,6 +4,7 @@ import pygame as pg
 import threading
 from .. import tool
 from .. import constants as c
+from .. import fonts
 from ..language import LANG
 from ..network import NETWORK
 
@@ -45,6 +46,13 @@ class GameReportScreen(tool.State):
         self.network_thread = None
         self.is_loading_data = False
 
+        # 静态底图、合成画面和各动态区域上次绘制时的数据及范围
+        self.base = None
+        self.base_key = None
+        self.frame = None
+        self.region_keys = {}
+        self.region_rects = {}
+
         # 加载背景图片
         self.background = None
         self.load_background()
@@ -72,6 +80,8 @@ class GameReportScreen(tool.State):
         self.is_offline = self.game_info.get('is_offline', True)
         self.rank = None
         self.leaderboard = []
+        # 合成好的画面在下次绘制时重建
+        self.frame = None
 
         # 初始化刷新时间
         self.last_refresh_time = current_time
@@ -123,8 +133,9 @@ class GameReportScreen(tool.State):
             self.refresh_leaderboard()
             self.last_refresh_time = current_time
 
-        # 绘制页面
-        self.draw(surface)
+        # 绘制页面（只运行逻辑时 surface 为 None）
+        if surface is not None:
+            self.draw(surface)
 
     def update_cursor(self, mouse_hover_pos):
         """根据鼠标位置更新光标样式"""
@@ -132,9 +143,9 @@ class GameReportScreen(tool.State):
             # 检查是否悬浮在按钮上
             if (self.play_again_button_rect.collidepoint(mouse_hover_pos) or
                 self.exit_button_rect.collidepoint(mouse_hover_pos)):
-                pg.mouse.set_cursor(pg.SYSTEM_CURSOR_HAND)
+                tool.set_cursor(pg.SYSTEM_CURSOR_HAND)
             else:
-                pg.mouse.set_cursor(pg.SYSTEM_CURSOR_ARROW)
+                tool.set_cursor(pg.SYSTEM_CURSOR_ARROW)
 
     def handle_mouse_click(self, mouse_pos):
         """处理鼠标点击"""
@@ -171,7 +182,44 @@ class GameReportScreen(tool.State):
             self.is_loading_data = False
 
     def draw(self, surface):
-        """绘制游戏报告页面 - PVZ风格"""
+        """绘制游戏报告页面 - PVZ风格
+
+        页面由静态底图和几块动态区域组成：底图（背景、横幅、成绩和击杀卡片）只在语言或成绩变化时
+        重新绘制；排名、排行榜和按钮各自记录绘制时用到的数据，数据变化时先用底图擦除原区域再重绘。
+        数据不变时每帧只需 blit 一次合成好的画面。
+        """
+        language = LANG.get_current_language()
+        base_key = (language, self.score, self.game_duration,
+                    tuple(self.zombies_killed.items()))
+        if self.frame is None or self.base_key != base_key:
+            self.base = pg.Surface((c.SCREEN_WIDTH, c.SCREEN_HEIGHT))
+            self.draw_base(self.base)
+            self.base_key = base_key
+            self.frame = self.base.copy()
+            self.region_keys = {}
+            self.region_rects = {}
+
+        leaderboard = () if self.is_offline else tuple(
+            (entry.get('name', 'Unknown'), entry.get('employee_id', ''), entry.get('score', 0))
+            for entry in self.leaderboard[:10])
+        self.update_region('rank', (language, self.is_offline, self.rank), self.draw_rank)
+        self.update_region('bottom', (language, leaderboard),
+                           lambda frame: self.draw_bottom(frame, leaderboard))
+
+        surface.blit(self.frame, (0, 0))
+
+    def update_region(self, name, key, draw_func):
+        """区域数据变化时，用底图擦除上次绘制的范围，再调用 draw_func 重绘（返回新的绘制范围）"""
+        if self.region_keys.get(name) == key:
+            return
+        old_rect = self.region_rects.get(name)
+        if old_rect:
+            self.frame.blit(self.base, old_rect, old_rect)
+        self.region_rects[name] = draw_func(self.frame)
+        self.region_keys[name] = key
+
+    def draw_base(self, surface):
+        """绘制不随网络数据变化的部分"""
         # 绘制背景
         if self.background:
             surface.blit(self.background, (0, 0))
@@ -202,23 +250,9 @@ class GameReportScreen(tool.State):
         self.draw_outlined_text(surface, str(self.score),
                                c.scale(100), c.scale(175), 36, PVZ_YELLOW, PVZ_BROWN_DARK)
 
-        # 绘制排名（调整 y 坐标避免遮挡标题）
+        # 绘制排名标签，排名本身在 draw_rank 中绘制（调整 y 坐标避免遮挡标题）
         self.draw_outlined_text(surface, LANG.get('report_rank'),
                                c.scale(260), c.scale(145), 18, PVZ_CREAM, PVZ_BROWN_DARK)
-        if self.is_offline:
-            rank_text = LANG.get('report_offline')
-            rank_color = c.RED
-            rank_size = 18
-        elif self.rank:
-            rank_text = LANG.get('report_rank_format').format(self.rank)
-            rank_color = PVZ_GREEN_LIGHT
-            rank_size = 28
-        else:
-            rank_text = LANG.get('report_no_rank')
-            rank_color = c.ORANGE
-            rank_size = 18
-        self.draw_outlined_text(surface, rank_text, c.scale(260), c.scale(175),
-                               rank_size, rank_color, PVZ_BROWN_DARK)
 
         # 绘制游戏时长（调整 y 坐标）
         duration_seconds = self.game_duration // 1000
@@ -245,12 +279,12 @@ class GameReportScreen(tool.State):
         total_kills = sum(self.zombies_killed.values())
         # 调整总击杀位置，确保在面板内（面板左边界410，内容从420开始）
         total_kills_text = LANG.get('report_total_kills').format(total_kills)
-        total_font = pg.font.SysFont('SimHei', c.scale(18), bold=True)
+        total_font = fonts.get_font('SimHei', c.scale(18), bold=True)
         total_surface = total_font.render(total_kills_text, True, PVZ_YELLOW)
         surface.blit(total_surface, (c.scale(425), c.scale(140)))
 
         y_offset = c.scale(168)
-        font = pg.font.SysFont('SimHei', c.scale(15))
+        font = fonts.get_font('SimHei', c.scale(15))
         for zombie_type, count in self.zombies_killed.items():
             if count > 0 and y_offset < kills_card_rect.bottom - c.scale(25):
                 zombie_name = LANG.get(zombie_name_map.get(zombie_type, zombie_type))
@@ -270,21 +304,42 @@ class GameReportScreen(tool.State):
 
                 y_offset += c.scale(22)
 
+    def draw_rank(self, surface):
+        """绘制排名，返回绘制范围"""
+        if self.is_offline:
+            rank_text = LANG.get('report_offline')
+            rank_color = c.RED
+            rank_size = 18
+        elif self.rank:
+            rank_text = LANG.get('report_rank_format').format(self.rank)
+            rank_color = PVZ_GREEN_LIGHT
+            rank_size = 28
+        else:
+            rank_text = LANG.get('report_no_rank')
+            rank_color = c.ORANGE
+            rank_size = 18
+        return self.draw_outlined_text(surface, rank_text, c.scale(260), c.scale(175),
+                                       rank_size, rank_color, PVZ_BROWN_DARK)
+
+    def draw_bottom(self, surface, leaderboard):
+        """绘制排行榜（如果在线）和按钮，按钮位置取决于是否显示排行榜，返回绘制范围
+
+        Args:
+            leaderboard: (名字, 工号, 分数) 列表，离线时为空
+        """
+        rect = None
         # 底部：排行榜卡片（如果在线）
-        if not self.is_offline and self.leaderboard:
+        if leaderboard:
             leaderboard_card_rect = pg.Rect(c.scale(25), c.scale(295),
                                              c.scale(750), c.scale(200))
-            self.draw_pvz_card(surface, leaderboard_card_rect, LANG.get('report_leaderboard'))
+            rect = self.draw_pvz_card(surface, leaderboard_card_rect, LANG.get('report_leaderboard'))
 
             y_offset = c.scale(335)
             col1_x = c.scale(50)
             col2_x = c.scale(410)
+            font = fonts.get_font('SimHei', c.scale(17))
 
-            for i, entry in enumerate(self.leaderboard[:10], 1):
-                name = entry.get('name', 'Unknown')
-                employee_id = entry.get('employee_id', '')
-                score = entry.get('score', 0)
-
+            for i, (name, employee_id, score) in enumerate(leaderboard, 1):
                 if employee_id:
                     display_name = f"{name}{employee_id}"
                 else:
@@ -301,30 +356,31 @@ class GameReportScreen(tool.State):
                     color = PVZ_CREAM
 
                 rank_text = f"{i}. {display_name}: {score}"
-                font = pg.font.SysFont('SimHei', c.scale(17))
                 text_surface = font.render(rank_text, True, color)
 
                 if i <= 5:
-                    surface.blit(text_surface, (col1_x, y_offset))
+                    rect.union_ip(surface.blit(text_surface, (col1_x, y_offset)))
                     y_offset += c.scale(26)
                 else:
                     if i == 6:
                         y_offset = c.scale(335)
-                    surface.blit(text_surface, (col2_x, y_offset))
+                    rect.union_ip(surface.blit(text_surface, (col2_x, y_offset)))
                     y_offset += c.scale(26)
 
         # 绘制按钮
-        button_y = c.scale(515) if (not self.is_offline and self.leaderboard) else c.scale(320)
+        button_y = c.scale(515) if leaderboard else c.scale(320)
         self.play_again_button_rect.y = button_y
         self.exit_button_rect.y = button_y
 
         # 再来一局按钮 - 绿色
-        self.draw_pvz_button(surface, self.play_again_button_rect,
-                            LANG.get('report_play_again'), PVZ_GREEN, 20)
+        button_rect = self.draw_pvz_button(surface, self.play_again_button_rect,
+                                           LANG.get('report_play_again'), PVZ_GREEN, 20)
+        rect = rect.union(button_rect) if rect else button_rect
 
         # 退出游戏按钮 - 红色
-        self.draw_pvz_button(surface, self.exit_button_rect,
-                            LANG.get('report_exit'), (180, 60, 60), 20)
+        rect.union_ip(self.draw_pvz_button(surface, self.exit_button_rect,
+                                           LANG.get('report_exit'), (180, 60, 60), 20))
+        return rect
 
     def draw_banner(self, surface, text, x, y):
         """绘制标题横幅（紫色飘带风格）"""
@@ -390,6 +446,7 @@ class GameReportScreen(tool.State):
         # 标题文字
         self.draw_outlined_text(surface, title, rect.centerx, rect.y + c.scale(22),
                                20, PVZ_YELLOW, PVZ_BROWN_DARK)
+        return rect.union(shadow_rect)
 
     def draw_pvz_button(self, surface, rect, text, base_color, font_size):
         """绘制PVZ风格按钮"""
@@ -415,18 +472,19 @@ class GameReportScreen(tool.State):
         # 按钮文字
         self.draw_outlined_text(surface, text, rect.centerx, rect.centery,
                                font_size, c.WHITE, PVZ_BROWN_DARK)
+        return rect.union(shadow)
 
     def draw_outlined_text(self, surface, text, x, y, size, color, outline_color):
-        """绘制带描边的文字"""
+        """绘制带描边的文字，返回绘制范围"""
         scaled_size = c.scale(size)
-        font = pg.font.SysFont('SimHei', scaled_size, bold=True)
+        font = fonts.get_font('SimHei', scaled_size, bold=True)
         outline_offset = c.scale(2)
 
         # 绘制描边
+        outline_surface = font.render(text, True, outline_color)
         for dx in [-outline_offset, 0, outline_offset]:
             for dy in [-outline_offset, 0, outline_offset]:
                 if dx != 0 or dy != 0:
-                    outline_surface = font.render(text, True, outline_color)
                     outline_rect = outline_surface.get_rect(center=(x + dx, y + dy))
                     surface.blit(outline_surface, outline_rect)
 
@@ -434,3 +492,4 @@ class GameReportScreen(tool.State):
         text_surface = font.render(text, True, color)
         text_rect = text_surface.get_rect(center=(x, y))
         surface.blit(text_surface, text_rect)
+        return text_rect.inflate(outline_offset * 2, outline_offset * 2)
@@ -33,8 +33,9 @@ class Screen(tool.State):
 
     def update(self, surface, current_time, mouse_pos, mouse_click, events, mouse_hover_pos=None):
         if(current_time - self.start_time) < self.end_time:
-            surface.fill(c.WHITE)
-            surface.blit(self.image, self.rect)
+            if surface is not None:
+                surface.fill(c.WHITE)
+                surface.blit(self.image, self.rect)
         else:
             self.done = True
 
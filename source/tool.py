@@ -5,13 +5,39 @@ import os
 os.environ["SDL_IME_SHOW_UI"] = "1"
 
 import json
+import time
+import weakref
 from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import pygame as pg
 from . import constants as c
+from . import fonts
+from . import atlas
+from . import manifest
+from . import frame_cache
 from .resource_path import resource_path
 
 _LOADING_SURFACE = None
 _LOADING_RECT = None
+# 无窗口运行（SDL dummy 驱动），由 init() 设置
+HEADLESS = False
+# 图片解码线程池，首次使用时创建
+_DECODE_POOL = None
+# get_image_fit 的结果：源图 -> {(裁剪矩形, colorkey, 目标尺寸, keep_ratio): Surface}，源图释放后随之清除
+_FIT_CACHE = weakref.WeakKeyDictionary()
+# 动画帧的预生成变体：原帧 -> {变体名: Surface}，见 make_frame_variants
+_FRAME_VARIANTS = weakref.WeakKeyDictionary()
+# 受击闪烁和冰冻时帧的透明度
+HIT_FRAME_ALPHA = 192
+# 分步执行的任务（见 run_with_deadline）必须在这个时刻之前让出主线程，None 表示不限时
+_DEADLINE = None
+# 被打断的任务已经生成的派生帧：参数 -> 帧列表，任务完成后清空
+_PREPARED_FRAMES = {}
+# 被打断的任务中读到一半的磁盘缓存：参数 -> frame_cache.iter_frames 生成器，任务完成后清空
+_PREPARED_STEPS = {}
 
 def _refresh_loading_screen():
     # Keep window responsive and avoid transient white areas during heavy loading.
@@ -35,6 +61,10 @@ class State():
         self.done = False
         self.next = None
         self.persist = {}
+        # 本帧需要刷新到窗口的区域，None 表示刷新整个窗口
+        self.dirty_rects = None
+        # 为 True 时状态运行期间用到的图片被钉住，不会被内存预算淘汰（见 GraphicsBudget）
+        self.pin_graphics = False
     
     @abstractmethod
     def startup(self, current_time, persist):
@@ -49,11 +79,19 @@ class State():
         '''abstract method'''
 
 class Control():
-    def __init__(self):
-        self.screen = pg.display.get_surface()
+    def __init__(self, draw=True):
+        """
+        Args:
+            draw: 是否绘制画面；为 False 时状态的 update 收到的 surface 为 None，只运行游戏逻辑
+        """
+        self.screen = SCREEN
         self.done = False
         self.clock = pg.time.Clock()
         self.fps = 60
+        # 无窗口运行时使用虚拟时钟，每帧固定前进 1000 / fps 毫秒，不等待真实时间
+        self.headless = HEADLESS
+        self.draw = draw
+        self.frame_count = 0
         self.keys = pg.key.get_pressed()
         self.mouse_pos = None
         self.mouse_click = [False, False]  # value:[left mouse click, right mouse click]
@@ -63,6 +101,7 @@ class Control():
         self.state_name = None
         self.state = None
         self.events = []  # 存储当前帧的所有事件
+        self.full_update = True  # 窗口被遮挡或改变大小后需要整屏刷新一次
         self.game_info = {c.CURRENT_TIME:0.0,
                           c.LEVEL_NUM:c.START_LEVEL_NUM}
  
@@ -70,13 +109,19 @@ class Control():
         self.state_dict = state_dict
         self.state_name = start_state
         self.state = self.state_dict[self.state_name]
+        if BUDGET is not None:
+            BUDGET.pinning = self.state.pin_graphics
         self.state.startup(self.current_time, self.game_info)
 
     def update(self):
-        self.current_time = pg.time.get_ticks()
+        if self.headless:
+            self.current_time = self.frame_count * 1000 // self.fps
+        else:
+            self.current_time = pg.time.get_ticks()
+        self.frame_count += 1
         if self.state.done:
             self.flip_state()
-        self.state.update(self.screen, self.current_time, self.mouse_pos,
+        self.state.update(self.screen if self.draw else None, self.current_time, self.mouse_pos,
                           self.mouse_click, self.events, self.mouse_hover_pos)
         self.mouse_pos = None
         self.mouse_click[0] = False
@@ -88,9 +133,17 @@ class Control():
         t0 = time.time()
         previous, self.state_name = self.state_name, self.state.next
         persist = self.state.cleanup()
+        if BUDGET is not None and self.state.pin_graphics:
+            # 关卡结束，解除钉住的图片，同时记下这一关的工作集
+            BUDGET.release_pins()
         self.state = self.state_dict[self.state_name]
+        if BUDGET is not None:
+            BUDGET.pinning = self.state.pin_graphics
         t1 = time.time()
         self.state.startup(self.current_time, persist)
+        if BUDGET is not None:
+            # 只在切换状态时按预算淘汰，游戏过程中不淘汰正在使用的图片
+            BUDGET.trim()
         t2 = time.time()
         print(f'[DEBUG] flip_state: {previous} -> {self.state_name}, cleanup: {t1-t0:.3f}s, startup: {t2-t1:.3f}s')
 
@@ -112,15 +165,101 @@ class Control():
                 print('pos:', self.mouse_pos, ' mouse:', self.mouse_click)
             elif event.type == pg.MOUSEMOTION:
                 self.mouse_hover_pos = pg.mouse.get_pos()
+            elif event.type in (pg.VIDEOEXPOSE, pg.VIDEORESIZE, pg.WINDOWEXPOSED):
+                self.full_update = True
+
+    def main(self, max_frames=None):
+        """主循环
 
-    def main(self):
+        Args:
+            max_frames: 运行的最大帧数，None 表示一直运行到退出
+        """
         while not self.done:
+            if max_frames is not None and self.frame_count >= max_frames:
+                break
             self.event_loop()
             self.update()
-            pg.display.update()
+            if self.headless:
+                # 没有窗口需要刷新，也不限制帧率，尽可能快地运行
+                continue
+            if self.full_update or self.state.dirty_rects is None:
+                pg.display.update()
+                self.full_update = False
+            else:
+                pg.display.update(self.state.dirty_rects)
             self.clock.tick(self.fps)
         print('game over')
 
+def make_frame_variants(frames):
+    """为一组动画帧预先生成变体，同一帧只生成一次，使用同一组帧的精灵共用
+
+    变体：
+        'hit': 受击闪烁时的半透明帧
+        'frozen': 冰冻时的帧，目前与 'hit' 相同
+    精灵在运行时只切换到变体的引用，不再对共用的帧调用 set_alpha。
+    """
+    for frame in frames:
+        if frame not in _FRAME_VARIANTS:
+            hit = frame.copy()
+            hit.set_alpha(HIT_FRAME_ALPHA)
+            _FRAME_VARIANTS[frame] = {'hit': hit, 'frozen': hit}
+
+def get_frame_variant(frame, variant):
+    """返回帧的变体，未预先生成时立即生成"""
+    variants = _FRAME_VARIANTS.get(frame)
+    if variants is None:
+        make_frame_variants((frame,))
+        variants = _FRAME_VARIANTS[frame]
+    return variants[variant]
+
+class OutOfTime(Exception):
+    """分步执行的任务用完了本帧的时间"""
+
+def check_deadline():
+    """开始一段较大的工作（解码转换一个文件、缩放一帧等）之前调用，超出时限时抛出 OutOfTime"""
+    if _DEADLINE is not None and time.perf_counter() >= _DEADLINE:
+        raise OutOfTime()
+
+def run_with_deadline(task, deadline):
+    """在 deadline（time.perf_counter() 的时刻）之前执行无参函数 task
+
+    超出时限时 task 被打断，已完成的部分（转换好的图片、缩放好的帧、生成的派生帧）
+    保留在各自的缓存中，之后再次调用 run_with_deadline(task, ...) 会跳过这些部分。
+    task 开始时就有一段工作不可再分，所以每次调用至少会推进一步。
+
+    Returns:
+        bool: task 是否已执行完
+    """
+    global _DEADLINE
+    _DEADLINE = deadline
+    try:
+        task()
+    except OutOfTime:
+        return False
+    except BaseException:
+        _clear_prepared()
+        raise
+    finally:
+        _DEADLINE = None
+    _clear_prepared()
+    return True
+
+@contextmanager
+def pinned_graphics():
+    """with 块中加载或访问的图片被钉住，直到下一个关卡结束（见 GraphicsBudget.release_pins）"""
+    if BUDGET is None:
+        yield
+        return
+    pinning, BUDGET.pinning = BUDGET.pinning, True
+    try:
+        yield
+    finally:
+        BUDGET.pinning = pinning
+
+def _clear_prepared():
+    _PREPARED_FRAMES.clear()
+    _PREPARED_STEPS.clear()
+
 def get_image(sheet, x, y, width, height, colorkey=c.BLACK, scale=1):
         src_x = int(x * c.ASSET_PIXEL_RATIO)
         src_y = int(y * c.ASSET_PIXEL_RATIO)
@@ -159,8 +298,22 @@ def get_image_fit(sheet, x, y, width, height, colorkey=c.BLACK, target_width=Non
         keep_ratio: 是否保持宽高比（默认 True）
 
     Returns:
-        缩放后的 Surface
+        缩放后的 Surface。同一源图、同一参数的结果会被缓存共享，调用方不要修改返回的 Surface
     """
+    key = (x, y, width, height, tuple(colorkey) if colorkey is not None else None,
+           target_width, target_height, keep_ratio)
+    cache = _FIT_CACHE.get(sheet)
+    if cache is None:
+        cache = {}
+        _FIT_CACHE[sheet] = cache
+    image = cache.get(key)
+    if image is None:
+        check_deadline()
+        image = _get_image_fit(sheet, x, y, width, height, colorkey, target_width, target_height, keep_ratio)
+        cache[key] = image
+    return image
+
+def _get_image_fit(sheet, x, y, width, height, colorkey, target_width, target_height, keep_ratio):
     src_x = int(x * c.ASSET_PIXEL_RATIO)
     src_y = int(y * c.ASSET_PIXEL_RATIO)
     src_w = int(width * c.ASSET_PIXEL_RATIO)
@@ -190,91 +343,470 @@ def get_image_fit(sheet, x, y, width, height, colorkey=c.BLACK, target_width=Non
         new_width = target_width if target_width else width
         new_height = target_height if target_height else height
 
-    # 计算缩放倍数，超过 2 倍使用 smoothscale 获得更好质量
+    return scale_image(image, (new_width, new_height))
+
+def scale_image(image, size):
+    """按 display_config.json 中 default 的配置把图片缩放到 size
+
+    缩小超过 2 倍时使用 smoothscale 获得更好质量。开启 enable_multipass 且缩小倍数
+    达到 multipass_threshold 时分多次缩小，每次不超过 max_step_size 倍。
+    """
+    config = SCALE_CONFIG
+    width, height = image.get_size()
+    new_width, new_height = max(1, size[0]), max(1, size[1])
     scale_factor = max(width / new_width, height / new_height)
-    if scale_factor > 2:
-        image = pg.transform.smoothscale(image, (new_width, new_height))
+    if scale_factor <= 2 or config.get('quality', 'smooth') != 'smooth':
+        return pg.transform.scale(image, (new_width, new_height))
+
+    if config.get('enable_multipass', False) and scale_factor >= config.get('multipass_threshold', 3.0):
+        step = max(config.get('max_step_size', 2.0), 1.1)
+        while scale_factor > step:
+            width = max(new_width, int(width / step))
+            height = max(new_height, int(height / step))
+            image = pg.transform.smoothscale(image, (width, height))
+            scale_factor = max(width / new_width, height / new_height)
+    return pg.transform.smoothscale(image, (new_width, new_height))
+
+def _decode_pool():
+    global _DECODE_POOL
+    if _DECODE_POOL is None:
+        _DECODE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                          thread_name_prefix='gfx-decode')
+    return _DECODE_POOL
+
+def decode_images(paths):
+    """在线程池中并行读取并解码图片文件
+
+    pg.image.load 解码时会释放 GIL，多个文件可以同时解码。
+    convert()/convert_alpha() 依赖显示模式，必须回到主线程调用 convert_image 完成。
+
+    Returns:
+        list: 与 paths 顺序一致的 Future 列表，结果为未转换的 Surface
+    """
+    pool = _decode_pool()
+    return [pool.submit(pg.image.load, path) for path in paths]
+
+def convert_image(img, colorkey):
+    if img.get_alpha():
+        img = convert_display(img, alpha=True)
     else:
-        image = pg.transform.scale(image, (new_width, new_height))
+        img = convert_display(img)
+        img.set_colorkey(colorkey)
+    return img
 
-    return image
+def convert_display(img, alpha=False):
+    """转换为显示格式；没有创建窗口时（init(display=False)）无法转换，保持原格式"""
+    if pg.display.get_surface() is None:
+        return img
+    return img.convert_alpha() if alpha else img.convert()
 
-def load_image_frames(directory, image_name, colorkey, accept, tick=None):
-    frame_list = []
+def load_image(path, colorkey):
+    return convert_image(pg.image.load(path), colorkey)
+
+def list_image_frames(directory, image_name, accept):
+    """返回帧目录下按帧序号排列的图片路径"""
     tmp = {}
     # image_name is "Peashooter", pic name is 'Peashooter_1', get the index 1
-    index_start = len(image_name) + 1 
-    frame_num = 0;
+    index_start = len(image_name) + 1
     for pic in os.listdir(directory):
-        if tick:
-            tick()
         name, ext = os.path.splitext(pic)
         if ext.lower() in accept:
             index = int(name[index_start:])
-            img = pg.image.load(os.path.join(directory, pic))
-            if img.get_alpha():
-                img = img.convert_alpha()
-            else:
-                img = img.convert()
-                img.set_colorkey(colorkey)
-            tmp[index]= img
-            frame_num += 1
+            tmp[index] = os.path.join(directory, pic)
+    return [tmp[i] for i in range(len(tmp))]
+
+def load_frame_files(paths, colorkey, tick=None):
+    """按顺序解码并转换一组帧图片"""
+    frame_list = []
+    for future in decode_images(paths):
+        frame_list.append(convert_image(future.result(), colorkey))
         if tick:
             tick()
-
-    for i in range(len(tmp)):
-        frame_list.append(tmp[i])
     return frame_list
 
-def load_all_gfx(directory, colorkey=c.WHITE, accept=('.png', '.jpg', '.bmp', '.gif')):
-    graphics = {}
-    refresh = _refresh_loading_screen
-    refresh_counter = 0
-
-    def tick():
-        nonlocal refresh_counter
-        refresh_counter += 1
-        if refresh_counter >= 30:
-            refresh_counter = 0
-            refresh()
+def index_all_gfx(directory, accept=('.png', '.jpg', '.bmp', '.gif'), tick=None):
+    """遍历图片目录，只建立名称到资源位置的索引，不解码图片
 
+    Returns:
+        dict: 名称 -> ('frames', 目录) 表示动画帧目录，
+              名称 -> ('image', 文件路径) 表示单张图片
+    """
+    index = {}
     for name1 in os.listdir(directory):
-        tick()
+        if tick:
+            tick()
         # subfolders under the folder resources\graphics
         dir1 = os.path.join(directory, name1)
         if os.path.isdir(dir1):
             for name2 in os.listdir(dir1):
-                tick()
+                if tick:
+                    tick()
                 dir2 = os.path.join(dir1, name2)
                 if os.path.isdir(dir2):
                 # e.g. subfolders under the folder resources\graphics\Zombies
                     for name3 in os.listdir(dir2):
-                        tick()
                         dir3 = os.path.join(dir2, name3)
                         # e.g. subfolders or pics under the folder resources\graphics\Zombies\ConeheadZombie
                         if os.path.isdir(dir3):
                             # e.g. it's the folder resources\graphics\Zombies\ConeheadZombie\ConeheadZombieAttack
                             image_name, _ = os.path.splitext(name3)
-                            graphics[image_name] = load_image_frames(dir3, image_name, colorkey, accept, tick)
+                            index[image_name] = ('frames', dir3)
                         else:
                             # e.g. pics under the folder resources\graphics\Plants\Peashooter
                             image_name, _ = os.path.splitext(name2)
-                            graphics[image_name] = load_image_frames(dir2, image_name, colorkey, accept, tick)
+                            index[image_name] = ('frames', dir2)
                             break
                 else:
                 # e.g. pics under the folder resources\graphics\Screen
                     name, ext = os.path.splitext(name2)
                     if ext.lower() in accept:
-                        img = pg.image.load(dir2)
-                        if img.get_alpha():
-                            img = img.convert_alpha()
-                        else:
-                            img = img.convert()
-                            img.set_colorkey(colorkey)
-                        graphics[name] = img
+                        index[name] = ('image', dir2)
+    return index
+
+def _loading_tick():
+    """返回一个计数函数，每调用 30 次刷新一次 Loading 画面"""
+    refresh_counter = 0
+
+    def tick():
+        nonlocal refresh_counter
+        refresh_counter += 1
+        if refresh_counter >= 30:
+            refresh_counter = 0
+            _refresh_loading_screen()
+    return tick
+
+def surface_bytes(image):
+    return image.get_width() * image.get_height() * image.get_bytesize()
+
+def derived_bytes(images):
+    """派生图片占用的字节数，同一个 Surface 只计一次，包括 make_frame_variants 生成的变体"""
+    surfaces = {}
+    for image in images:
+        surfaces[id(image)] = image
+        for variant in _FRAME_VARIANTS.get(image, {}).values():
+            surfaces[id(variant)] = variant
+    return sum(surface_bytes(image) for image in surfaces.values())
+
+class GraphicsBudget():
+    """按字节统计已解码图片占用的内存，超出预算时淘汰最久未使用的资源
+
+    多个 LazyGraphics 可以共用一个预算。由资源裁剪缩放得到的派生图片（动画帧缓存、卡片图片等）
+    记在源资源名下，淘汰源资源时一并从所在的缓存中删除。被淘汰的资源下次访问时会重新加载。
+    max_bytes 为 0 时不限制。
+
+    淘汰只在 trim 中进行，由 Control 在切换状态时调用。pinning 为 True 期间（关卡运行中、
+    预取关卡资源时）记账或访问的资源被钉住，直到 release_pins 之前都不会被淘汰。
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # 实测的关卡工作集：关卡结束时钉住的资源总字节数，取历次最大值；预算不会低于它
+        self.working_set = 0
+        self.pinning = False
+        self._pinned = set()
+        # (id(graphics), name) -> [graphics, name, 字节数, {(id(缓存), 键): (缓存, 键)}]，按最近使用排序
+        self._entries = OrderedDict()
+
+    def touch(self, graphics, name):
+        key = (id(graphics), name)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            if self.pinning:
+                self._pinned.add(key)
+
+    def add(self, graphics, name, size, cache=None, cache_key=None):
+        """把 size 字节记到资源 name 名下；指定 cache 时，淘汰该资源会同时删除 cache[cache_key]"""
+        key = (id(graphics), name)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [graphics, name, 0, {}]
+            self._entries[key] = entry
+        else:
+            self._entries.move_to_end(key)
+        entry[2] += size
+        self.total_bytes += size
+        if cache is not None:
+            entry[3][(id(cache), cache_key)] = (cache, cache_key)
+        if self.pinning:
+            self._pinned.add(key)
+
+    def release_pins(self):
+        """解除所有资源的钉住状态，并把钉住的总量记入关卡工作集"""
+        pinned = sum(self._entries[key][2] for key in self._pinned if key in self._entries)
+        self.working_set = max(self.working_set, pinned)
+        self._pinned.clear()
+
+    def trim(self):
+        """超出预算时从最久未使用的资源开始淘汰，钉住的资源保留
+
+        预算取 max_bytes 和实测的关卡工作集中较大的一个，再次进入同一关时不需要重新解码。
+        """
+        if not self.max_bytes:
+            return
+        limit = max(self.max_bytes, self.working_set)
+        for key in list(self._entries):
+            if self.total_bytes <= limit:
+                break
+            if key not in self._pinned and key in self._entries:
+                entry = self._entries[key]
+                self.remove(entry[0], entry[1])
+
+    def remove(self, graphics, name):
+        """淘汰资源，连同记在它名下的派生图片"""
+        key = (id(graphics), name)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._pinned.discard(key)
+        owner, _, size, derived = entry
+        self.total_bytes -= size
+        for cache, cache_key in derived.values():
+            cache.pop(cache_key, None)
+        owner._evict(name)
+
+class LazyGraphics(Mapping):
+    """按需解码的图片资源表
+
+    创建时只建立索引，第一次访问 GFX[name] 时才解码对应的图片或帧列表，
+    之后的访问直接返回已解码的结果。生成过资源清单时（见 source/manifest.py）
+    索引和帧文件列表直接取自清单，不再遍历目录。指定 budget 时，超出内存预算会淘汰最久未使用的资源，
+    再次访问时重新加载。
+    """
+    def __init__(self, directory, colorkey=c.WHITE, accept=('.png', '.jpg', '.bmp', '.gif'), budget=None):
+        self.directory = directory
+        self.colorkey = colorkey
+        self.accept = accept
+        self.budget = budget
+        self._manifest = manifest.load_manifest(directory)
+        if self._manifest:
+            self._index = {name: (entry['kind'], None)
+                           for name, entry in self._manifest['assets'].items()}
+        else:
+            self._index = index_all_gfx(directory, accept)
+        self._loaded = {}
+        # 打包过图集时，帧直接从图集页切出（见 source/atlas.py）
+        self._atlas = atlas.load_index(directory)
+        # 子 Surface 会引用所在的图集页，页上的资源全部被淘汰后图集页随之释放
+        self._atlas_pages = weakref.WeakValueDictionary()
+        # 图集页序号 -> 已加载的、帧在这一页上的资源名；图集页整页计入内存预算，只计一次
+        self._page_names = {}
+        # 已提交给解码线程池、尚未转换的资源：名称 -> (类型, Future 列表, 已转换的图片)，图集页序号 -> Future
+        self._pending = {}
+        self._pending_pages = {}
+        # 分步加载被打断时已转换、还没有资源引用的图集页，防止被当作无人引用释放
+        self._held_pages = {}
+
+    def __getitem__(self, name):
+        graphics = self._loaded.get(name)
+        if graphics is None:
+            kind, _ = self._index[name]
+            if _DEADLINE is not None:
+                # 分步执行的任务中，解码交给线程池，主线程只逐个转换
+                self.prefetch(name)
+            if name in self._pending:
+                graphics = self._convert_pending(name)
+            elif self._atlas and name in self._atlas['frames']:
+                graphics = self._load_atlas_frames(name)
+            elif kind == 'frames':
+                graphics = load_frame_files(self.source_files(name), self.colorkey)
+            else:
+                graphics = load_image(self.source_files(name)[0], self.colorkey)
+            self._add(name, graphics)
+        else:
+            self.touch(name)
+        return graphics
+
+    def _add(self, name, graphics):
+        self._loaded[name] = graphics
+        pages = self._pages_of(name)
+        for page in pages:
+            self._held_pages.pop(page, None)
+        if not self.budget:
+            return
+        if pages:
+            # 图集帧是图集页的子 Surface，不单独占用像素，内存按整页计算
+            for page in pages:
+                names = self._page_names.setdefault(page, set())
+                if not names:
+                    self.budget.add(self, ('atlas', page), surface_bytes(self._atlas_pages[page]))
+                else:
+                    self.budget.touch(self, ('atlas', page))
+                names.add(name)
+            self.budget.add(self, name, 0)
+        else:
+            self.budget.add(self, name, derived_bytes(graphics if isinstance(graphics, list) else [graphics]))
+
+    def _evict(self, name):
+        if isinstance(name, tuple):
+            # 淘汰图集页时，帧在这一页上的资源都要淘汰，否则子 Surface 会让整页继续占用内存
+            _, page = name
+            for other in list(self._page_names.pop(page, ())):
+                self.budget.remove(self, other)
+            return
+        graphics = self._loaded.pop(name, None)
+        if graphics is not None:
+            # get_image_fit 的结果按源帧缓存，随源资源一起释放
+            for frame in graphics if isinstance(graphics, list) else [graphics]:
+                _FIT_CACHE.pop(frame, None)
+        for page in self._pages_of(name):
+            names = self._page_names.get(page)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    self.budget.remove(self, ('atlas', page))
+
+    def _pages_of(self, name):
+        if self._atlas and name in self._atlas['frames']:
+            return {page for page, _, _, _, _ in self._atlas['frames'][name]}
+        return set()
+
+    def _budget_names(self, name):
+        return [name] + [('atlas', page) for page in self._pages_of(name)]
+
+    def touch(self, name):
+        """标记资源 name 刚被使用；派生缓存命中时调用，使源资源不被优先淘汰"""
+        if self.budget:
+            for key in self._budget_names(name):
+                self.budget.touch(self, key)
+
+    def add_derived(self, name, images, cache, key):
+        """把由资源 name 生成、保存在 cache[key] 中的图片计入内存预算
+
+        淘汰 name 时 cache[key] 随之删除，之后使用方重新生成。name 尚未加载时
+        （例如派生帧直接取自磁盘缓存）也会记账，同样参与淘汰。
+        """
+        if self.budget:
+            self.budget.add(self, name, derived_bytes(images), cache, key)
+
+    def prefetch(self, name):
+        """把资源提交给解码线程池提前解码，之后的 GFX[name] 只需在主线程完成转换"""
+        if name in self._loaded or name in self._pending:
+            return
+        if self._atlas and name in self._atlas['frames']:
+            for page, _, _, _, _ in self._atlas['frames'][name]:
+                if page not in self._atlas_pages and page not in self._pending_pages:
+                    self._pending_pages[page] = decode_images([self._atlas_page_path(page)])[0]
+            return
+        kind, _ = self._index[name]
+        self._pending[name] = (kind, decode_images(self.source_files(name)), [])
+
+    def _convert_pending(self, name, tick=None):
+        kind, futures, images = self._pending[name]
+        # 分步执行时被打断过的资源从上次转换到的文件继续
+        for future in futures[len(images):]:
+            if _DEADLINE is not None and not future.done():
+                raise OutOfTime()
+            check_deadline()
+            images.append(convert_image(future.result(), self.colorkey))
+            if tick:
+                tick()
+        del self._pending[name]
+        return images if kind == 'frames' else images[0]
+
+    def source_files(self, name):
+        """返回资源对应的原始图片文件路径，不解码图片"""
+        if self._manifest:
+            return [os.path.join(self.directory, *file.split('/'))
+                    for file in self._manifest['assets'][name]['files']]
+        kind, path = self._index[name]
+        if kind == 'frames':
+            return list_image_frames(path, name, self.accept)
+        return [path]
+
+    def _atlas_page_path(self, page):
+        info = self._atlas['pages'][page]
+        return os.path.join(atlas.get_atlas_dir(self.directory), info['file'])
+
+    def _get_atlas_page(self, page):
+        surface = self._atlas_pages.get(page)
+        if surface is None:
+            future = self._pending_pages.get(page)
+            if _DEADLINE is not None and future is not None and not future.done():
+                raise OutOfTime()
+            check_deadline()
+            future = self._pending_pages.pop(page, None)
+            if future is not None:
+                surface = convert_image(future.result(), self.colorkey)
+            else:
+                surface = load_image(self._atlas_page_path(page), self.colorkey)
+            self._atlas_pages[page] = surface
+            if _DEADLINE is not None:
+                self._held_pages[page] = surface
+        return surface
+
+    def _load_atlas_frames(self, name):
+        frame_list = []
+        for page, x, y, width, height in self._atlas['frames'][name]:
+            sheet = self._get_atlas_page(page)
+            frame = sheet.subsurface((x, y, width, height))
+            colorkey = sheet.get_colorkey()
+            if colorkey is not None:
+                frame.set_colorkey(colorkey)
+            frame_list.append(frame)
+        return frame_list
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def load_all(self, tick=None):
+        """一次性解码全部资源
+
+        先把所有文件提交给解码线程池，再在主线程依次转换，解码与转换可以重叠进行。
+        """
+        for name in self._index:
+            self.prefetch(name)
+        for name in self._index:
+            if name not in self._loaded:
+                if name in self._pending:
+                    self._add(name, self._convert_pending(name, tick))
+                else:
+                    self[name]
+            if tick:
                 tick()
-    refresh()
-    return graphics
+
+def load_derived_frames(name, params, builder):
+    """读取由 GFX[name] 裁剪缩放得到的帧，优先使用磁盘缓存（见 source/frame_cache.py）
+
+    Args:
+        name: GFX 中的资源名
+        params: 影响裁剪/缩放结果的参数，例如裁剪矩形、colorkey、缩放比例
+        builder: 无参函数，未命中缓存时调用，返回 Surface 列表
+
+    Returns:
+        list: Surface 列表
+    """
+    params = (name,) + tuple(params) + (SCALE_CONFIG,)
+    if _DEADLINE is None:
+        return frame_cache.load_frames(GFX.source_files(name), params, builder)
+
+    # 分步执行：逐帧读取磁盘缓存，被打断时保留读取进度，任务重新执行时从中断处继续
+    key = json.dumps(params, default=str)
+    frames = _PREPARED_FRAMES.get(key)
+    if frames is None:
+        steps = _PREPARED_STEPS.get(key)
+        if steps is None:
+            steps = frame_cache.iter_frames(GFX.source_files(name), params, builder)
+            _PREPARED_STEPS[key] = steps
+        try:
+            while True:
+                check_deadline()
+                next(steps)
+        except StopIteration as e:
+            frames = e.value
+        except OutOfTime:
+            if steps.gi_frame is None:
+                # builder 内部被打断，生成器已结束；已缩放的帧保留在 get_image_fit 的缓存中
+                del _PREPARED_STEPS[key]
+            raise
+        del _PREPARED_STEPS[key]
+        _PREPARED_FRAMES[key] = frames
+    return frames
 
 def loadZombieImageRect():
     file_path = resource_path('source', 'data', 'entity', 'zombie.json')
@@ -283,6 +815,14 @@ def loadZombieImageRect():
     f.close()
     return data[c.ZOMBIE_IMAGE_RECT]
 
+def loadScaleConfig():
+    """读取 display_config.json 中的默认缩放配置（多级缩小等）"""
+    file_path = resource_path('source', 'data', 'entity', 'display_config.json')
+    f = open(file_path)
+    data = json.load(f)
+    f.close()
+    return data.get('default', {})
+
 def loadPlantImageRect():
     file_path = resource_path('source', 'data', 'entity', 'plant.json')
     f = open(file_path)
@@ -292,7 +832,7 @@ def loadPlantImageRect():
 
 def renderText(text, font_size, color, bg_color=None):
     """渲染文字，返回 Surface 对象"""
-    font = pg.font.SysFont('Arial', c.scale(font_size))
+    font = fonts.get_font('Arial', c.scale(font_size))
     if bg_color:
         text_surface = font.render(text, True, color, bg_color)
     else:
@@ -318,7 +858,7 @@ def renderInputBox(surface, rect, text, active, font_size=24, composing_text='')
                       rect[2] - c.scale(4), rect[3] - c.scale(4))
     pg.draw.rect(surface, c.BLACK, bg_rect)
     # 渲染文字
-    font = pg.font.SysFont('SimHei', c.scale(font_size))
+    font = fonts.get_font('SimHei', c.scale(font_size))
     scaled_font_size = c.scale(font_size)
     text_x = rect[0] + c.scale(10)
     text_y = rect[1] + (rect[3] - scaled_font_size) // 2
@@ -337,6 +877,11 @@ def renderInputBox(surface, rect, text, active, font_size=24, composing_text='')
         pg.draw.rect(surface, c.GOLD, underline_rect)
         surface.blit(composing_surface, (text_x, text_y))
 
+def set_cursor(cursor):
+    """设置系统鼠标光标；dummy 驱动不支持系统光标，无窗口运行时忽略"""
+    if not HEADLESS:
+        pg.mouse.set_cursor(cursor)
+
 def fadeInText(surface, text, alpha, pos, font_size=30, color=c.WHITE):
     """渲染渐入文字效果
     Args:
@@ -347,33 +892,75 @@ def fadeInText(surface, text, alpha, pos, font_size=30, color=c.WHITE):
         font_size: 字体大小
         color: 文字颜色
     """
-    font = pg.font.SysFont('Arial', c.scale(font_size))
+    font = fonts.get_font('Arial', c.scale(font_size))
     text_surface = font.render(text, True, color)
     text_surface.set_alpha(alpha)
     surface.blit(text_surface, pos)
 
-pg.init()
-pg.display.set_caption(c.ORIGINAL_CAPTION)
-SCREEN = pg.display.set_mode(c.SCREEN_SIZE, pg.RESIZABLE | pg.SCALED)
-# 启用按键重复：首次延迟500ms，之后每50ms重复（用于长按backspace等）
-pg.key.set_repeat(500, 50)
-# 初始化剪贴板模块（用于粘贴功能）
-pg.scrap.init()
-
-# 显示加载提示
-SCREEN.fill((0, 0, 0))
-_loading_font = pg.font.SysFont('Arial', c.scale(48))
-_loading_text = _loading_font.render('Loading...', True, (255, 255, 255))
-_loading_rect = _loading_text.get_rect(center=(c.SCREEN_WIDTH // 2, c.SCREEN_HEIGHT // 2))
-SCREEN.blit(_loading_text, _loading_rect)
-pg.display.flip()
-_LOADING_SURFACE = _loading_text
-_LOADING_RECT = _loading_rect
-del _loading_font
-
-GFX = load_all_gfx(resource_path("resources", "graphics"))
-ORIGIN_GFX = load_all_gfx(resource_path("resources", "origin_graphics"))
-_LOADING_SURFACE = None
-_LOADING_RECT = None
+def init(display=True, assets='lazy', headless=False):
+    """初始化 pygame、游戏窗口和图片资源
+
+    导入 tool 模块不会创建窗口或加载资源，游戏入口（source/main.py）需要先调用本函数。
+    工具脚本、性能测试等可以按需跳过窗口和资源加载。
+
+    Args:
+        display: 是否创建游戏窗口；为 False 时 SCREEN 是一块离屏 Surface
+        assets: 'lazy'  只建立资源索引，图片在第一次访问时才解码
+                'eager' 启动时解码全部图片
+                'none'  不加载图片资源，GFX / ORIGIN_GFX 保持为 None
+        headless: 使用 SDL 的 dummy 视频/音频驱动，在没有显示器的机器（CI、批量模拟）上运行；
+                  窗口照常创建（convert 等需要显示模式），但不会显示出来
+    """
+    global SCREEN, GFX, ORIGIN_GFX, BUDGET, _LOADING_SURFACE, _LOADING_RECT, HEADLESS
+    if assets not in ('lazy', 'eager', 'none'):
+        raise ValueError(f'unknown assets mode: {assets}')
+
+    HEADLESS = headless
+    if headless:
+        # 必须在 pygame 初始化显示模块之前设置
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    pg.init()
+    if display:
+        pg.display.set_caption(c.ORIGINAL_CAPTION)
+        SCREEN = pg.display.set_mode(c.SCREEN_SIZE, pg.RESIZABLE | pg.SCALED)
+        # 启用按键重复：首次延迟500ms，之后每50ms重复（用于长按backspace等）
+        pg.key.set_repeat(500, 50)
+        if not headless:
+            # 初始化剪贴板模块（用于粘贴功能）
+            pg.scrap.init()
+    else:
+        SCREEN = pg.Surface(c.SCREEN_SIZE)
+
+    if assets == 'none':
+        return
+
+    # 只建立索引，图片在第一次访问时才解码；两套资源共用一个内存预算，一次性加载全部时不限制
+    BUDGET = GraphicsBudget(0 if assets == 'eager' else c.GFX_MEMORY_BUDGET)
+    GFX = LazyGraphics(resource_path("resources", "graphics"), budget=BUDGET)
+    ORIGIN_GFX = LazyGraphics(resource_path("resources", "origin_graphics"), budget=BUDGET)
+
+    if assets == 'eager':
+        if display:
+            # 显示加载提示
+            SCREEN.fill((0, 0, 0))
+            loading_font = fonts.get_font('Arial', c.scale(48))
+            _LOADING_SURFACE = loading_font.render('Loading...', True, (255, 255, 255))
+            _LOADING_RECT = _LOADING_SURFACE.get_rect(center=(c.SCREEN_WIDTH // 2, c.SCREEN_HEIGHT // 2))
+            SCREEN.blit(_LOADING_SURFACE, _LOADING_RECT)
+            pg.display.flip()
+        tick = _loading_tick()
+        GFX.load_all(tick)
+        ORIGIN_GFX.load_all(tick)
+        _LOADING_SURFACE = None
+        _LOADING_RECT = None
+
+# 由 init() 设置
+SCREEN = None
+GFX = None
+BUDGET = None
+ORIGIN_GFX = None
 ZOMBIE_RECT = loadZombieImageRect()
 PLANT_RECT = loadPlantImageRect()
+SCALE_CONFIG = loadScaleConfig()